@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+# SPDX-FileCopyrightText: 2014-present William Schoenell <wschoenell@gmail.com>
+# SPDX-License-Identifier: GPL-2.0-or-later
+"""
+Benchmarks of the chimera_lna hot paths.
+
+Times the dome lookup table at several table sizes, the geometric dome
+azimuth, STATUS frame parsing, command round trips through the DomeLNA I/O
+worker against the dome simulator, and OpdWeather value access against the
+weather simulator. No hardware is needed: the instruments talk to the
+chimera_lna.simulators servers over localhost.
+
+Results are written as JSON (one record per benchmark: per-call min,
+median, mean, p95 and stdev in seconds), so runs of different releases can
+be compared:
+
+    benchmark.py --output v0.2.0.json
+    benchmark.py --output new.json --compare v0.2.0.json --tolerance 0.25
+
+With --compare, any benchmark whose median got slower by more than the
+tolerance is reported and the exit status is 1.
+
+Usage:
+    benchmark.py [--output FILE] [--only GROUP[,GROUP...]] [--quick]
+                 [--compare FILE] [--tolerance 0.2]
+"""
+
+import argparse
+import datetime
+import importlib.metadata
+import itertools
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+BENCHMARKS = []
+
+
+def benchmark(group):
+    """Register a benchmark function: it returns a list of result records."""
+
+    def register(function):
+        BENCHMARKS.append((group, function))
+        return function
+
+    return register
+
+
+def measure(name, function, params=None, number=1, repeat=50):
+    """
+    Time `function` in `repeat` samples of `number` calls each and return
+    per-call statistics (seconds).
+    """
+    function()  # warm up caches, lazy loads and connections
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            function()
+        samples.append((time.perf_counter() - t0) / number)
+    samples.sort()
+    return {
+        "name": name,
+        "params": params or {},
+        "unit": "s",
+        "calls": number * repeat,
+        "min": samples[0],
+        "median": statistics.median(samples),
+        "mean": statistics.fmean(samples),
+        "p95": samples[min(len(samples) - 1, int(0.95 * len(samples)))],
+        "stdev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+    }
+
+
+def _random_model(path, rows, rng):
+    """A synthetic dome model CSV (alt[rad], az[rad], tag) with `rows` rows."""
+    alt = np.arcsin(rng.uniform(0.0, 1.0, rows))  # uniform over the hemisphere
+    az = rng.uniform(0.0, 2.0 * np.pi, rows)
+    tags = rng.integers(801, 983, rows)
+    np.savetxt(path, np.column_stack([alt, az, tags]), fmt="%.6f,%.6f,%d")
+
+
+@benchmark("lookup")
+def bench_lookup(options):
+    from chimera_lna.util.lookup_table import DomeLookupTable
+
+    rng = np.random.default_rng(0)
+    queries = list(zip(rng.uniform(0, 90, 1000), rng.uniform(0, 360, 1000)))
+
+    def run(lookup, name, params):
+        positions = itertools.cycle(queries)
+
+        def lookup_one():
+            alt, az = next(positions)
+            lookup.get_tag_altaz(alt, az)
+
+        return measure(
+            name, lookup_one, params, number=options.number, repeat=options.repeat
+        )
+
+    packaged = DomeLookupTable()
+    results = [
+        run(packaged, "lookup.get_tag_altaz", {"rows": len(packaged._tags)}),
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        # synthetic tables have no compiled raster: this is the exact search
+        for rows in options.table_sizes:
+            path = os.path.join(tmp, f"model_{rows}.csv")
+            _random_model(path, rows, rng)
+            results.append(
+                run(
+                    DomeLookupTable(path),
+                    "lookup.get_tag_altaz",
+                    {"rows": rows, "raster": False},
+                )
+            )
+    alt, az = np.array(queries).T
+    results.append(
+        measure(
+            "lookup.get_tags_altaz",
+            lambda: packaged.get_tags_altaz(alt, az),
+            {"rows": len(packaged._tags), "points": len(alt)},
+            repeat=options.repeat,
+        )
+    )
+    return results
+
+
+@benchmark("dome_offset")
+def bench_calc_dome_az(options):
+    from chimera_lna.util.dome_offset import calc_dome_az
+
+    geometry = (np.radians(-22.53), 0.0, 0.0, 30.0, 49.2, 147.0)
+    night = np.linspace(-np.pi / 2, np.pi / 2, 10000)
+    return [
+        measure(
+            "calc_dome_az",
+            lambda: calc_dome_az(0.3, -0.4, *geometry),
+            {"points": 1},
+            number=options.number,
+            repeat=options.repeat,
+        ),
+        measure(
+            "calc_dome_az",
+            lambda: calc_dome_az(night, -0.4, *geometry),
+            {"points": len(night)},
+            repeat=options.repeat,
+        ),
+    ]
+
+
+def _dome(simulator, **config):
+    """A DomeLNA with its I/O worker running against the simulator."""
+    from chimera_lna.instruments.domelna import DomeLNA
+
+    dome = DomeLNA()
+    dome["device"] = simulator.device
+    for key, value in config.items():
+        dome[key] = value
+    dome._start_io()
+    return dome
+
+
+@benchmark("parse_status")
+def bench_parse_status(options):
+    from chimera_lna.simulators.dome import DomeSimulator
+
+    with DomeSimulator() as simulator:
+        dome = _dome(simulator)
+        try:
+            frames = {
+                "valid": "        900 *0010000000000000",
+                "blank": "            *0001010000101000",
+                "corrupted": "        979 *0p11010010001000",
+            }
+            return [
+                measure(
+                    "DomeLNA._parse_status",
+                    lambda frame=frame: dome._parse_status(frame),
+                    {"frame": kind},
+                    number=options.number,
+                    repeat=options.repeat,
+                )
+                for kind, frame in frames.items()
+            ]
+        finally:
+            dome._stop_io()
+
+
+@benchmark("command")
+def bench_command(options):
+    from chimera_lna.simulators.dome import DomeSimulator
+
+    with DomeSimulator() as simulator:
+        dome = _dome(simulator)
+        try:
+            results = [
+                measure(
+                    "DomeLNA._command",
+                    lambda cmd=cmd: dome._command(cmd),
+                    {"command": cmd},
+                    repeat=options.repeat,
+                )
+                for cmd in ("MEADE PROG STATUS", "MEADE FLAT_WEAK LIGAR")
+            ]
+
+            # round trips while other threads keep the worker busy too
+            stop = threading.Event()
+
+            def load():
+                while not stop.is_set():
+                    dome._command("MEADE PROG STATUS")
+
+            threads = [threading.Thread(target=load) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            try:
+                results.append(
+                    measure(
+                        "DomeLNA._command",
+                        lambda: dome._command("MEADE PROG STATUS"),
+                        {"command": "MEADE PROG STATUS", "concurrent_callers": 4},
+                        repeat=options.repeat,
+                    )
+                )
+            finally:
+                stop.set()
+                for thread in threads:
+                    thread.join()
+            return results
+        finally:
+            dome._stop_io()
+
+
+@benchmark("weather")
+def bench_weather(options):
+    from chimera_lna.instruments.opdweather import OpdWeather
+    from chimera_lna.simulators.weather import WeatherSimulator
+
+    with WeatherSimulator() as simulator:
+        weather = OpdWeather()
+        weather["api_url"] = simulator.url
+        results = [
+            measure(
+                "OpdWeather.temperature",
+                weather.temperature,
+                {"cached": True},
+                number=options.number,
+                repeat=options.repeat,
+            )
+        ]
+        weather["check_interval"] = 0  # every access queries the API
+        results.append(
+            measure(
+                "OpdWeather.temperature",
+                weather.temperature,
+                {"cached": False},
+                repeat=options.repeat,
+            )
+        )
+        return results
+
+
+def _key(result):
+    return result["name"], json.dumps(result["params"], sort_keys=True)
+
+
+def compare(results, baseline, tolerance):
+    """Print median ratios against a baseline run; return the regressions."""
+    reference = {_key(result): result for result in baseline["results"]}
+    regressions = []
+    for result in results:
+        old = reference.get(_key(result))
+        if old is None or not old["median"]:
+            continue
+        ratio = result["median"] / old["median"]
+        flag = "  REGRESSION" if ratio > 1.0 + tolerance else ""
+        print(f"{result['name']} {result['params']}: x{ratio:.2f}{flag}")
+        if flag:
+            regressions.append(result)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    groups = sorted({group for group, _ in BENCHMARKS})
+    parser.add_argument("--output", default="benchmark.json")
+    parser.add_argument(
+        "--only", help=f"comma-separated groups to run ({', '.join(groups)})"
+    )
+    parser.add_argument(
+        "--quick", action="store_true", help="fewer samples (smoke run)"
+    )
+    parser.add_argument("--compare", help="baseline JSON to compare against")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="allowed median slowdown vs the baseline (0.2 = 20%%)",
+    )
+    options = parser.parse_args()
+    options.number, options.repeat = (100, 5) if options.quick else (1000, 30)
+    options.table_sizes = (1000, 10000) if options.quick else (1000, 10000, 100000)
+
+    selected = set(options.only.split(",")) if options.only else set(groups)
+    results = []
+    with tempfile.TemporaryDirectory() as cache:
+        # the lookup tables cache their parsed CSVs (the synthetic ones
+        # too): keep them out of the user's ~/.cache
+        os.environ["XDG_CACHE_HOME"] = cache
+        for group, function in BENCHMARKS:
+            if group in selected:
+                print(f"running {group}...", file=sys.stderr)
+                results.extend(function(options))
+
+    try:
+        version = importlib.metadata.version("chimera_lna")
+    except importlib.metadata.PackageNotFoundError:
+        version = None
+    report = {
+        "chimera_lna": version,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "timestamp": datetime.datetime.now(datetime.UTC).isoformat(),
+        "results": results,
+    }
+    with open(options.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"wrote {len(results)} results to {options.output}", file=sys.stderr)
+
+    if options.compare:
+        with open(options.compare) as f:
+            if compare(results, json.load(f), options.tolerance):
+                return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,2 +1,4 @@
 #!/usr/bin/env bash
 awk 'BEGIN { FS = "," } ; { printf "%.6f,%.6f,%d\n",$3,$4,$9 }' model.csv | grep -v "0.000000,0.000000,0" > dome_model.csv
+# the compiled tag raster must follow the CSV (DomeLookupTable ignores a stale one)
+python -c "from chimera_lna.util.lookup_table import compile_raster; compile_raster()"
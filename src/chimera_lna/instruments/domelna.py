@@ -2,13 +2,17 @@
 # SPDX-License-Identifier: GPL-2.0-or-later
 """Driver for the COTE/LNA custom dome (serial "MEADE" protocol)."""
 
+import collections
+import itertools
 import math
 import os
 import queue
+import random
 import re
+import termios
 import threading
 import time
-from concurrent.futures import Future
+from concurrent.futures import CancelledError, Future
 
 import serial
 from chimera.core import SYSTEM_CONFIG_DIRECTORY
@@ -21,7 +25,18 @@ from chimera.interfaces.dome import (
     Style,
 )
 
-from chimera_lna.util.lookup_table import DomeLookupTable
+from chimera_lna.util.capture import SessionCapture
+from chimera_lna.util.device_watch import DeviceWatch
+from chimera_lna.util.follow import FollowStats, lead_path
+from chimera_lna.util.frames import STRAY_LENGTH, StatusFrameAssembler
+from chimera_lna.util.kinematics import DomeKinematics
+from chimera_lna.util.lookup_table import DomeLookupTable, TagCache
+from chimera_lna.util.metrics import MetricsRegistry
+from chimera_lna.util.slew import CANCELLED, FINAL_STATES, MOVING, SlewHandle
+from chimera_lna.util.trace import TraceLog
+
+# queued by the device watch to wake the I/O worker (see _device_appeared)
+_WAKE = ("wake",)
 
 
 class DomeSlewTimeoutException(ChimeraException):
@@ -64,12 +79,25 @@ class DomeLNA(DomeBase, LampBase):
         "model": "COTE/LNA custom dome",
         "style": Style.Classic,
         "az_resolution": 2,  # will not move if (delta az) < 2 deg
-        "serial_timeout": 10.0,  # seconds
+        "serial_timeout": 10.0,  # seconds, longest wait for a reply
+        "slit_timeout": 14.0,  # seconds, reply wait for slit commands
         "retry_delay": 2.0,  # seconds between command retries
         "poll_interval": 1.0,  # seconds between dome status polls
         "motion_wait": 20.0,  # seconds to wait for a running motion command
         "io_deadline": 30.0,  # seconds a command may spend retrying the port
         "heal_interval": 5.0,  # seconds between reconnect probes while down
+        "idle_poll_interval": 5.0,  # seconds between background polls when idle
+        "watch_device": True,  # reopen as soon as the device node reappears
+        "metrics_file": "",  # Prometheus text file written periodically, if set
+        "metrics_interval": 60.0,  # seconds between metrics_file writes
+        "debug_log_max_bytes": 16 * 1024 * 1024,  # rotate dome-debug.log at
+        "debug_log_max_age": 86400.0,  # ... or after this many seconds
+        "debug_log_backups": 14,  # rotated segments kept
+        "debug_log_compress": True,  # gzip rotated segments
+        "capture_file": "",  # record every serial transaction here, if set
+        "follow_lead": 0.0,  # seconds to place the dome ahead when following
+        "site_latitude": -22.5344,  # degrees (OPD), for follow_lead
+        "recovery_approach": 24,  # tags of run-up for a slew retried after reset
     }
 
     def __init__(self):
@@ -85,21 +113,65 @@ class DomeLNA(DomeBase, LampBase):
         # submit commands through _io_queue and wait on a Future, so exactly
         # one thread ever touches the port (no reconnect-under-reader races).
         self._serial = None
-        self._io_queue = queue.Queue()
+        # (priority, sequence, queued at, work): most urgent class first,
+        # FIFO within a class (see _io_priority)
+        self._io_queue = queue.PriorityQueue()
+        # set when a safety-class item is queued (see _pause)
+        self._urgent = threading.Event()
+        self._io_sequence = itertools.count()
+        # recent reply round trips per command (see _reply_timeout)
+        self._rtt = collections.defaultdict(
+            lambda: collections.deque(maxlen=self._rtt_window)
+        )
+        # commands (see _rtt_key) whose last try went unanswered: the next
+        # one waits the ceiling, not the learned timeout (see _attempt)
+        self._unanswered = set()
+        # worker only: STATUS replies are read through it (see
+        # _read_status_frame)
+        self._frames = StatusFrameAssembler()
         self._io_thread = None
+        # reconnect backoff (jittered down to half of each) when the device
+        # cannot be watched, or is there but does not open
         self._reconnect_delays = (0.5, 2.0, 5.0)
+        self._device_watch = None
 
         # Link health. While the dome is not answering, status queries skip
         # the port entirely (they answer from the cache) and the worker
         # probes for recovery every heal_interval, forever.
         self._io_healthy = True
         self._next_heal = 0.0
+        self._unhealthy_since = None  # monotonic start of the current outage
+        self._unhealthy_seconds = 0.0  # in outages already over
+
+        # Single-flight: callers asking for a read-only command that is
+        # already queued or on the wire wait on that transaction's Future
+        # instead of queueing their own (cmd -> Future).
+        self._in_flight = {}
+        self._in_flight_lock = threading.Lock()
 
         # Motion commands exclude each other with a bounded wait: a caller
         # that cannot start within motion_wait gives up instead of parking a
-        # bus worker for a whole slew. RLock: slew_to_az can reach
-        # _init_dome on the same thread through _get_tag.
+        # bus worker for a whole slew.
         self._motion_lock = threading.RLock()
+        # Slews, by id (see slew_to_az_async): the last few are kept for
+        # slew_progress; the one holding the motion lock is _active_slew.
+        self._slews = collections.OrderedDict()
+        self._slews_lock = threading.Lock()
+        self._active_slew = None
+        # the newest slew handed over to the running one (see _hand_over)
+        self._successor = None
+
+        # Controller initialization state, driven by the STATUS frames:
+        # "unknown" (no frame yet) -> "uninitialized" (blank tag field) ->
+        # "initializing" (background reset to the park tag) -> "ready" (a
+        # frame with a tag). Reads never initialize: they report the last
+        # known state and the worker hands initialization to a background
+        # thread (see _request_init).
+        self._init_state = "unknown"
+        self._init_thread = None
+        self._next_init = 0.0  # no new attempt before this (monotonic)
+        # _parse_status runs on the worker and on callers: one init thread
+        self._init_lock = threading.Lock()
 
         # Few parameters...
         self._init_az = 108
@@ -113,29 +185,46 @@ class DomeLNA(DomeBase, LampBase):
 
         # Last valid STATUS frame: (tag, busy, monotonic timestamp).
         # get_az()/is_slewing() answer from this instead of queueing their
-        # own STATUS command: a slew in progress polls STATUS every
-        # poll_interval, so during motion the cache is always fresher than
-        # the TTL and callers get an instant answer.
+        # own STATUS command: the I/O worker polls STATUS in the background
+        # whenever the frame gets older than poll_interval (dome moving) or
+        # idle_poll_interval (dome idle), so the cache is always fresher
+        # than the TTL and callers get an instant answer.
         self._status_cache = None
-        self._status_cache_ttl = 2.0  # seconds; > poll_interval
-
-        # Load LookUp table
+        self._last_poll = 0.0  # monotonic time of the last background poll
+        self._poll_asap = True  # poll on the next idle moment (after a move)
+        # (sparse until, dense until): a slew waiting for its predicted
+        # arrival, then polling around it itself (see _wait_slew)
+        self._slew_window = None
+
+        # LookUp table: the model is parsed on the first lookup and shared by
+        # every instance in the process, so restarts do not reload it
         self._lookup = DomeLookupTable()
-
-        # Debug file
-        self._debug_log = None
-        try:
-            self._debug_log = open(
-                os.path.join(SYSTEM_CONFIG_DIRECTORY, "dome-debug.log"), "w"
-            )
-        except OSError as e:
-            self.log.warning(f"Could not create dome debug file ({str(e)})")
+        # the control loop asks for the tag of nearly the same pointing every
+        # cycle while tracking: memoize it on a 0.05 deg grid
+        self._tag_cache = TagCache(self._lookup)
+        # slew times, learned from the slews made (see _wait_slew)
+        self._kinematics = DomeKinematics()
+        # moves and time on target while following a tracking telescope
+        # (see _target_tags)
+        self._follow = FollowStats()
+
+        # Latency and reliability metrics (see get_metrics); the *_stats()
+        # methods below are views of them
+        self._metrics = MetricsRegistry("chimera_lna_dome_", self._metrics_help)
+        self._metrics.on_collect(self._collect_metrics)
+        self._metrics_thread = None
+        self._metrics_stop = threading.Event()
+
+        # Serial trace (dome-debug.log), written by a background thread
+        # (see _start_trace)
+        self._trace = None
+        # Wire-level session capture, for simulators.replay (see
+        # _start_capture)
+        self._capture = None
 
     def __start__(self):
-        self._io_thread = threading.Thread(
-            target=self._io_loop, name="DomeLNA-serial", daemon=True
-        )
-        self._io_thread.start()
+        self._start_io()
+        self._start_metrics_file()
         # On start, reset the dome to the park tag, read the position back
         # and check the controller answers idle. A dome that is off or
         # unplugged must not stop the instrument from starting: the worker
@@ -150,14 +239,109 @@ class DomeLNA(DomeBase, LampBase):
 
     def __stop__(self):
         super().__stop__()
-        self._io_queue.put(None)
-        if self._io_thread is not None:
-            self._io_thread.join(timeout=self["serial_timeout"] + 5)
+        stats = self._tag_cache.stats()
+        self.log.info(
+            f"Dome lookup cache: {stats['hits']} hits, {stats['misses']} misses."
+        )
+        coalesced = int(self._metrics.counter("coalesced_requests_total").value)
+        self.log.info(f"Dome STATUS coalescing saved {coalesced} transactions.")
+        dropped = self.dropped_command_stats()
+        self.log.info(
+            f"Dome I/O dropped {dropped['cancelled']} cancelled and "
+            f"{dropped['expired']} expired commands unsent."
+        )
+        for name, wait in self.queue_wait_stats().items():
+            self.log.info(
+                f"Dome I/O queue wait ({name}): {wait['count']} commands, "
+                f"mean {wait['mean']:.3f}s, max {wait['max']:.3f}s."
+            )
+        self._stop_io()
+        self._stop_metrics_file()
 
     # ------------------------------------------------------------------
     # serial I/O: everything below _io_loop runs on the worker thread only
     # ------------------------------------------------------------------
 
+    def _start_io(self):
+        self._start_trace()
+        self._start_capture()
+        self._start_device_watch()
+        self._io_thread = threading.Thread(
+            target=self._io_loop, name="DomeLNA-serial", daemon=True
+        )
+        self._io_thread.start()
+
+    def _stop_io(self):
+        # behind everything already queued, like the commands before it
+        self._enqueue(None, len(self._io_classes))
+        if self._io_thread is not None:
+            self._io_thread.join(
+                timeout=max(self["serial_timeout"], self["slit_timeout"]) + 5
+            )
+        if self._device_watch is not None:
+            self._device_watch.stop()
+            self._device_watch = None
+        if self._trace is not None:
+            self._trace.close()
+            self._trace = None
+        if self._capture is not None:
+            self._capture.close()
+            self._capture = None
+
+    def _start_trace(self):
+        """
+        The serial trace goes to a ring buffer that a background thread
+        writes out, rotates and compresses: the worker never waits on the
+        disk, and the previous run's trace is kept as a segment instead of
+        being truncated.
+        """
+        try:
+            self._trace = TraceLog(
+                os.path.join(SYSTEM_CONFIG_DIRECTORY, "dome-debug.log"),
+                max_bytes=self["debug_log_max_bytes"],
+                max_seconds=self["debug_log_max_age"],
+                backups=self["debug_log_backups"],
+                compress=self["debug_log_compress"],
+            ).start()
+        except OSError as e:
+            self.log.warning(f"Could not create dome debug file ({str(e)})")
+            self._trace = None
+
+    def _start_capture(self):
+        """
+        Record every serial transaction (bytes out, bytes in, timing) to
+        capture_file, so a night can be served back by
+        chimera_lna.simulators.replay.
+        """
+        if not self["capture_file"]:
+            return
+        try:
+            self._capture = SessionCapture(self["capture_file"]).start()
+        except OSError as e:
+            self.log.warning(f"Could not create dome capture file ({str(e)})")
+            self._capture = None
+
+    def _start_device_watch(self):
+        """
+        Watch a local device node (not a pyserial URL) so a USB adapter that
+        re-enumerates is reopened the moment it is back, instead of on the
+        next reconnect or heal timer.
+        """
+        if not self["watch_device"] or "://" in self["device"]:
+            return
+        try:
+            self._device_watch = DeviceWatch(
+                self["device"], on_appear=self._device_appeared
+            ).start()
+        except OSError as e:
+            self.log.info(f"Not watching {self['device']} ({e}); timed reconnects.")
+
+    def _device_appeared(self):
+        # watch thread: wake the worker to probe now
+        self._debug("watch", detail="device node appeared")
+        self._next_heal = 0.0
+        self._enqueue(_WAKE, 0)
+
     def _create_serial(self):
         return serial.serial_for_url(
             self["device"], baudrate=9600, timeout=self["serial_timeout"]
@@ -178,30 +362,158 @@ class DomeLNA(DomeBase, LampBase):
         """
         self._open_port()
         while True:
+            due = self._poll_due() if self._io_healthy else self._next_heal
             try:
-                item = self._io_queue.get(timeout=self["heal_interval"])
+                priority, _, queued_at, item = self._io_queue.get(
+                    timeout=max(0.0, due - time.monotonic())
+                )
             except queue.Empty:
-                self._heal()
+                if self._io_healthy:
+                    self._poll_status()
+                else:
+                    self._heal()
                 continue
             if item is None:
                 break
-            cmd, future, deadline = item
-            try:
-                if not self._io_healthy and time.monotonic() < self._next_heal:
-                    # link known bad with a probe already scheduled: answer
-                    # immediately so callers fall back to the cache instead
-                    # of waiting out a serial timeout they cannot win
-                    future.set_result("")
-                else:
-                    future.set_result(self._attempt(cmd, deadline))
-            except Exception as e:
-                # the worker must outlive any single command
-                self.log.exception(f"Dome I/O worker error on '{cmd}' ({e}).")
-                if not future.done():
-                    future.set_result("")
+            if item is _WAKE:
+                continue
+            self._run_item(priority, queued_at, item)
         self._close()
         self._fail_pending()
 
+    def _run_item(self, priority, queued_at, item):
+        """Run one queued command or command sequence (worker thread)."""
+        cmd, future, deadline = item
+        steps = None
+        if not isinstance(cmd, str):
+            steps, cmd = cmd, "sequence"
+        # what an unanswered command or a failed sequence comes back as
+        failed = "" if steps is None else False
+        self._metrics.histogram(
+            "queue_wait_seconds",
+            io_class=self._io_classes[priority],
+            command=self._rtt_key(cmd),
+        ).observe(time.monotonic() - queued_at)
+        if not future.set_running_or_notify_cancel():
+            self._metrics.counter("dropped_commands_total", reason="cancelled").inc()
+            self._debug("drop", cmd, "caller left")
+            return
+        if time.monotonic() >= deadline:
+            self._metrics.counter("dropped_commands_total", reason="expired").inc()
+            self._debug("drop", cmd, "expired in queue")
+            future.set_result(failed)
+            return
+        if priority == 1 or steps is not None:
+            # the dome may be moving now: refresh its state right away
+            self._poll_asap = True
+        try:
+            if not self._io_healthy and time.monotonic() < self._next_heal:
+                # link known bad with a probe already scheduled: answer
+                # immediately so callers fall back to the cache instead
+                # of waiting out a serial timeout they cannot win
+                future.set_result(failed)
+            elif steps is not None:
+                future.set_result(self._run_steps(steps, deadline))
+            else:
+                future.set_result(self._attempt(cmd, deadline))
+        except Exception as e:
+            # the worker must outlive any single command
+            self.log.exception(f"Dome I/O worker error on '{cmd}' ({e}).")
+            if not future.done():
+                future.set_result(failed)
+
+    def _run_steps(self, steps, deadline):
+        """
+        Run a command sequence back to back (see _sequence). Returns True
+        when every step succeeded; stops at the first that did not.
+        """
+        for step, arg in steps:
+            self._debug("step", arg if step == "command" else "", step)
+            if step == "command":
+                ok = self._step_command(arg, deadline)
+            elif step == "sleep":
+                ok = not self._pause(min(arg, deadline - time.monotonic()))
+            else:
+                ok = self._step_status(step, min(deadline, time.monotonic() + arg))
+            if not ok:
+                self._debug("step", "", f"{step} failed")
+                return False
+        return True
+
+    def _step_command(self, cmd, deadline):
+        """A "command" step: send cmd until the dome ACKs it."""
+        for attempt in range(self._restart_tries):
+            if attempt:
+                if time.monotonic() + self["retry_delay"] >= deadline:
+                    return False
+                self._metrics.counter(
+                    "command_retries_total", command=self._rtt_key(cmd)
+                ).inc()
+                if self._pause(self["retry_delay"]):
+                    return False
+            budget = min(deadline, time.monotonic() + self["io_deadline"])
+            if "ACK" in self._attempt(cmd, budget):
+                return True
+        return False
+
+    def _step_status(self, step, until):
+        """
+        An "answer" or "idle" step: poll STATUS until the controller
+        answers at all (a valid or blank frame) or reports itself idle.
+        """
+        while True:
+            budget = min(until, time.monotonic() + self["serial_timeout"])
+            status = self._parse_status(self._attempt("MEADE PROG STATUS", budget))
+            if isinstance(status, tuple):
+                if step == "answer" or not status[1]:
+                    return True
+            elif status == "blank" and step == "answer":
+                return True
+            remaining = until - time.monotonic()
+            if remaining <= 0:
+                return False
+            if self._pause(min(self["poll_interval"], remaining)):
+                return False
+
+    def _pause(self, seconds):
+        """
+        Wait inside a sequence, running the safety commands (closing the
+        slit, stopping the dome) queued in the meantime instead of holding
+        them behind the sequence. Returns True when one of them stopped the
+        dome: the sequence must end there, not move it again.
+        """
+        until = time.monotonic() + seconds
+        stopped = False
+        while not stopped:
+            remaining = until - time.monotonic()
+            if remaining <= 0:
+                break
+            if self._urgent.wait(remaining):
+                self._urgent.clear()
+                for entry in self._take_urgent():
+                    self._run_item(entry[0], entry[2], entry[3])
+                    stopped = stopped or entry[3][0] == "MEADE PROG PARAR"
+        if stopped:
+            self._debug("step", "", "stopped by PARAR")
+        return stopped
+
+    def _take_urgent(self):
+        """
+        Dequeue the safety-class items waiting in the I/O queue. Wake
+        markers (see _device_appeared) are dropped: the worker is awake.
+        """
+        taken = []
+        io_queue = self._io_queue
+        while True:
+            with io_queue.mutex:
+                # the heap head is the most urgent entry; the worker is the
+                # only consumer, so it is still there for get_nowait()
+                if not io_queue.queue or io_queue.queue[0][0] != 0:
+                    return taken
+            entry = io_queue.get_nowait()
+            if entry[3] is not _WAKE:
+                taken.append(entry)
+
     def _open_port(self):
         try:
             self._serial = self._create_serial()
@@ -217,26 +529,108 @@ class DomeLNA(DomeBase, LampBase):
         Run cmd, reconnecting and retrying until the dome answers or the
         caller's deadline passes. Returns the reply, or "" when the dome
         never answered — callers read that as a missing ACK and retry.
+
+        A try that only missed the learned timeout says nothing about the
+        link (the board can stay silent for seconds, LCBTMO): it
+        is retried at the ceiling, and only a miss there marks the link
+        down and reopens the port. Past the deadline the retry is left to
+        the command's next attempt.
         """
+        key = self._rtt_key(cmd)
         while True:
             reply = ""
+            learned = False
             try:
                 if self._serial is None:
                     raise serial.SerialException("serial port is not open")
-                reply = self._command_once(cmd)
-            except (serial.SerialException, OSError, TypeError, ValueError) as e:
+                ceiling = self._reply_bounds(cmd)[1]
+                timeout = ceiling
+                if key not in self._unanswered:
+                    timeout = self._reply_timeout(cmd)
+                    learned = timeout < ceiling
+                reply = self._command_once(cmd, timeout)
+            except (
+                serial.SerialException,
+                OSError,
+                termios.error,
+                TypeError,
+                ValueError,
+            ) as e:
                 # a half-open port (USB gone mid-read) fails inside pyserial
-                # in more ways than SerialException alone
+                # in more ways than SerialException alone: a hung-up tty
+                # raises termios.error from the buffer flushes
                 self.log.warning(f"Serial error sending '{cmd}' ({e}).")
-                self._debug(f"[error] '{cmd}' - {e}")
+                self._debug("error", cmd, str(e))
+                learned = False
             if reply:
+                self._unanswered.discard(key)
                 self._mark_healthy()
                 return reply
+            self._unanswered.add(key)
+            if learned:
+                if time.monotonic() >= deadline:
+                    return ""
+                continue
             self._mark_unhealthy()
             if time.monotonic() >= deadline:
                 return ""
+            self._metrics.counter(
+                "serial_retries_total", command=self._rtt_key(cmd)
+            ).inc()
             self._reconnect(deadline)
 
+    def _poll_period(self):
+        cached = self._status_cache
+        if cached is None or not cached[1]:
+            return self["idle_poll_interval"]
+        window = self._slew_window
+        if window is not None and time.monotonic() < window[0]:
+            # a slew waiting for its predicted arrival: readers still get
+            # the freshness the cache TTL is built on
+            return self["idle_poll_interval"]
+        return self["poll_interval"]
+
+    def _poll_due(self):
+        """
+        Monotonic time of the next background STATUS poll: one period after
+        the newest frame or poll. Frames read by callers (a slew polling for
+        idle) count, so the poller only fills the gaps between them.
+        """
+        if self._poll_asap:
+            # right after a move too: the frame from before it is stale
+            return 0.0
+        cached = self._status_cache
+        newest = max(self._last_poll, cached[2] if cached else 0.0)
+        due = newest + self._poll_period()
+        window = self._slew_window
+        if window is not None and due >= window[0]:
+            # the slew polls every poll_interval from there itself
+            return max(due, window[1])
+        return due
+
+    def _poll_status(self):
+        """Background STATUS poll: one attempt, refreshing the cache."""
+        self._poll_asap = False
+        self._last_poll = time.monotonic()
+        self._metrics.counter("status_polls_total").inc()
+        # a deadline already passed: a single attempt, never a reconnect
+        # cycle; a miss at the ceiling marks the link down and _heal takes
+        # over, a miss of the learned timeout only makes the next poll wait
+        # the ceiling
+        self._parse_status(self._attempt("MEADE PROG STATUS", self._last_poll))
+
+    def status_poll_stats(self):
+        """
+        Background status poller: polls so far, current poll period and age
+        of the cached STATUS frame (seconds, None before the first frame).
+        """
+        cached = self._status_cache
+        return {
+            "polls": int(self._metrics.counter("status_polls_total").value),
+            "period": self._poll_period(),
+            "cache_age": time.monotonic() - cached[2] if cached else None,
+        }
+
     def _heal(self):
         """Probe a down link, forever, until the dome answers again."""
         if self._io_healthy or time.monotonic() < self._next_heal:
@@ -245,14 +639,16 @@ class DomeLNA(DomeBase, LampBase):
         # can block for a whole serial timeout, and commands arriving in the
         # meantime must still fast-fail to the cache
         self._next_heal = time.monotonic() + self["heal_interval"]
-        self._debug("[heal] probing the dome")
+        self._debug("heal", detail="probing the dome")
         if self._serial is None and not self._open_port():
             return
         reply = ""
         try:
-            reply = self._command_once("MEADE PROG STATUS")
+            # the full ceiling: a dome that merely got slower must still be
+            # able to answer a probe (and re-teach the learned timeout)
+            reply = self._command_once("MEADE PROG STATUS", self["serial_timeout"])
         except Exception as e:
-            self._debug(f"[heal] {e}")
+            self._debug("heal", detail=str(e))
         if reply and self._parse_status(reply) is not None:
             self._mark_healthy()
             return
@@ -262,6 +658,9 @@ class DomeLNA(DomeBase, LampBase):
     def _mark_healthy(self):
         if not self._io_healthy:
             self.log.info("Dome serial link recovered.")
+            if self._unhealthy_since is not None:
+                self._unhealthy_seconds += time.monotonic() - self._unhealthy_since
+                self._unhealthy_since = None
         self._io_healthy = True
 
     def _mark_unhealthy(self):
@@ -271,6 +670,8 @@ class DomeLNA(DomeBase, LampBase):
                 "status will be served from the last known frame while "
                 "the driver keeps trying to reconnect."
             )
+            self._unhealthy_since = time.monotonic()
+            self._metrics.counter("link_down_total").inc()
         self._io_healthy = False
         self._next_heal = time.monotonic() + self["heal_interval"]
 
@@ -283,52 +684,331 @@ class DomeLNA(DomeBase, LampBase):
         """
         self._close()
         self._serial = None
-        for delay in self._reconnect_delays:
+        watch = self._device_watch
+        for attempt, delay in enumerate(self._reconnect_delays):
+            delay *= random.uniform(0.5, 1.0)
             if deadline is not None and time.monotonic() + delay >= deadline:
                 return False
-            time.sleep(delay)
+            if watch is not None and not watch.exists():
+                # unplugged/re-enumerating: open the moment the node is back
+                watch.wait(delay)
+            elif watch is None or attempt:
+                time.sleep(delay)
             try:
                 self._serial = self._create_serial()
                 self.log.info("Reopened the dome serial port.")
+                self._metrics.counter("reconnects_total", result="ok").inc()
                 return True
             except Exception as e:
                 self.log.warning(f"Dome reconnect failed ({e}).")
+                self._metrics.counter("reconnects_total", result="failed").inc()
                 self._serial = None
         return False
 
     def _fail_pending(self):
         while True:
             try:
-                item = self._io_queue.get_nowait()
+                item = self._io_queue.get_nowait()[3]
             except queue.Empty:
                 return
-            if item is not None and not item[1].done():
-                item[1].set_result("")
-
-    def _command_once(self, cmd):
-        self._serial.reset_output_buffer()
-        self._serial.reset_input_buffer()
-        self._debug(f"[write] '{cmd}'")
-        self._serial.write(f"{cmd}\r".encode())
-        t0 = time.time()
-        ack = ""
-        while "\r" not in ack:
-            waiting = self._serial.in_waiting
-            data = self._serial.read(waiting if waiting else 1)
-            ack += data.decode(errors="replace")
-            if (time.time() - t0) > self["serial_timeout"]:
-                self.log.debug("Error reading serial... Trying to flush it.")
-                self._serial.reset_input_buffer()
-                self._serial.reset_output_buffer()
-                self._debug("[read ] flush - '{}'".format(repr(ack).replace("'", "")))
-                return ack.replace("\r", "")
-        self._debug("[read ] '{}'".format(repr(ack).replace("'", "")))
-        return ack.replace("\r", "")
+            if item is not None and item is not _WAKE and not item[1].done():
+                # "" for a command, False for a sequence (see _run_item)
+                item[1].set_result("" if isinstance(item[0], str) else False)
+
+    # Reply timeouts are learned per command from the round trips the worker
+    # sees: _rtt_margin times the slowest of the last _rtt_window replies,
+    # clamped to a floor and a ceiling. Until _rtt_min_samples replies were
+    # seen, the ceiling. STATUS answers in tens of milliseconds, so a dead
+    # link shows in a fraction of a second; the floors keep a slow but
+    # healthy board from being declared dead. From the firmware
+    # (docs/cote_src): the board can stay silent for LCBTMO (6 s) while it
+    # reads a tag before a move or reset, and drives the slit for TRAPTMO
+    # (12 s, measured 8 s) before it answers, which slit_timeout covers.
+    _rtt_window = 64
+    _rtt_min_samples = 8
+    _rtt_margin = 3.0
+    _reply_floors = {
+        "MEADE PROG STATUS": 0.3,
+        "MEADE DOMO MOVER": 6.0,
+        "MEADE PROG RESET": 6.0,
+    }
+    _default_reply_floor = 1.0
+    _slit_commands = frozenset({"MEADE TRAPEIRA ABRIR", "MEADE TRAPEIRA FECHAR"})
+
+    @staticmethod
+    def _rtt_key(cmd):
+        """cmd without its argument: every MOVER shares one history."""
+        return cmd.split(" = ", 1)[0]
+
+    def _reply_bounds(self, cmd):
+        """(floor, ceiling) of cmd's reply timeout, in seconds."""
+        if cmd in self._slit_commands:
+            # the board answers after its fixed relay delay, whatever the
+            # link does: nothing to learn below it
+            return self["slit_timeout"], self["slit_timeout"]
+        floor = self._reply_floors.get(self._rtt_key(cmd), self._default_reply_floor)
+        ceiling = self["serial_timeout"]
+        return min(floor, ceiling), ceiling
+
+    def _reply_timeout(self, cmd):
+        floor, ceiling = self._reply_bounds(cmd)
+        samples = self._rtt.get(self._rtt_key(cmd))
+        if not samples or len(samples) < self._rtt_min_samples:
+            return ceiling
+        return min(max(self._rtt_margin * max(samples), floor), ceiling)
+
+    # The port's read timeout follows the reply timeout on a geometric ladder
+    # (_port_timeout_base * _port_timeout_step ** n), rounded up: the learned
+    # timeout moves with every reply, and setting the port's timeout
+    # reconfigures the tty each time. A read that gets nothing blocks for
+    # the whole step, up to 25 % past the reply timeout.
+    _port_timeout_base = 0.05
+    _port_timeout_step = 1.25
+
+    @classmethod
+    def _port_timeout(cls, timeout):
+        """The smallest step of the ladder not below timeout, in seconds."""
+        ratio = max(timeout, cls._port_timeout_base) / cls._port_timeout_base
+        # the epsilon keeps a timeout already on the ladder where it is
+        n = math.ceil(math.log(ratio, cls._port_timeout_step) - 1e-9)
+        return round(cls._port_timeout_base * cls._port_timeout_step**n, 6)
+
+    def reply_timeout_stats(self):
+        """
+        Learned reply timeouts: {command: {"samples", "median", "max",
+        "timeout"}} in seconds, for every command seen so far.
+        """
+        stats = {}
+        for key, samples in list(self._rtt.items()):
+            samples = sorted(samples)
+            stats[key] = {
+                "samples": len(samples),
+                "median": samples[len(samples) // 2],
+                "max": samples[-1],
+                "timeout": self._reply_timeout(key),
+            }
+        return stats
+
+    def _command_once(self, cmd, timeout=None):
+        """
+        One write/read transaction. timeout defaults to the command's
+        learned reply timeout.
+        """
+        if timeout is None:
+            timeout = self._reply_timeout(cmd)
+        port_timeout = self._port_timeout(timeout)
+        if self._serial.timeout != port_timeout:
+            # bounds each blocking read in _read_frame; a tcsetattr() call,
+            # so only when the step changes
+            self._serial.timeout = port_timeout
+        self._debug("write", cmd)
+        sent = time.monotonic()
+        try:
+            self._serial.reset_output_buffer()
+            self._serial.reset_input_buffer()
+            self._serial.write(f"{cmd}\r".encode())
+            if cmd in self._framed_commands:
+                frame, complete, raw = self._read_status_frame(timeout)
+            else:
+                frame, complete = self._read_frame(timeout)
+                raw = frame
+        except Exception as e:
+            if self._capture is not None:
+                self._capture.transaction(
+                    sent, cmd, b"", False, time.monotonic() - sent, str(e)
+                )
+            raise
+        if self._capture is not None:
+            self._capture.transaction(sent, cmd, raw, complete, time.monotonic() - sent)
+        reply = frame.decode(errors="replace")
+        if not complete:
+            self._metrics.counter(
+                "reply_timeouts_total", command=self._rtt_key(cmd)
+            ).inc()
+            self.log.debug("Error reading serial... Trying to flush it.")
+            self._serial.reset_input_buffer()
+            self._serial.reset_output_buffer()
+            self._debug("flush", cmd, reply)
+            return reply
+        rtt = time.monotonic() - sent
+        self._rtt[self._rtt_key(cmd)].append(rtt)
+        self._metrics.histogram(
+            "serial_rtt_seconds", command=self._rtt_key(cmd)
+        ).observe(rtt)
+        self._debug("read", cmd, reply)
+        return reply
+
+    def _read_frame(self, timeout):
+        """
+        Read one reply frame: the bytes up to the first "\r", without it.
+        Returns (frame, complete); complete is False when the terminator did
+        not arrive within timeout, and frame then holds whatever did.
+
+        Reads whatever is waiting in one call, looks for the terminator only
+        in the newly read chunk and accumulates into one bytearray, so a
+        frame costs a few reads instead of a decode, a string copy and a
+        scan of the whole reply per byte. Bytes after the terminator are
+        dropped: the next command flushes the input buffer anyway.
+        """
+        frame = bytearray()
+        deadline = time.monotonic() + timeout
+        while True:
+            chunk = self._serial.read(self._serial.in_waiting or 1)
+            end = chunk.find(b"\r")
+            if end >= 0:
+                frame += chunk[:end]
+                return frame, True
+            frame += chunk
+            # an empty read already waited out the port timeout
+            if not chunk or time.monotonic() >= deadline:
+                return frame, False
+
+    # replies read through the STATUS frame assembler (see _read_status_frame)
+    _framed_commands = frozenset({"MEADE PROG STATUS"})
+
+    def _read_status_frame(self, timeout):
+        """
+        Read a STATUS reply through the frame assembler. Returns (frame,
+        complete, raw), raw being every byte read up to the reply's "\r".
+
+        A frame behind leading garbage is salvaged, and short segments that
+        cannot be the reply (a late ACK to an earlier command, a noise
+        burst ending in a stray "\r") are skipped while the reply is still
+        on its way, instead of being returned as the reply and costing a
+        retry_delay. A segment long enough to be the frame but corrupted is
+        the reply only when no well-formed frame follows it in the bytes
+        already read or waiting: _parse_status then rejects it. Segments
+        are fed to the assembler one at a time, so those after the frame
+        used are dropped uncounted.
+        """
+        assembler = self._frames
+        assembler.reset()
+        raw = bytearray()
+        used = 0  # raw bytes up to the end of the last segment, terminator included
+        corrupted = None  # the first corrupted segment, and used after it
+        deadline = time.monotonic() + timeout
+        while True:
+            chunk = self._serial.read(self._serial.in_waiting or 1)
+            raw += chunk
+            start = 0
+            while start < len(chunk):
+                end = chunk.find(b"\r", start) + 1 or len(chunk)
+                for frame, segment in assembler.feed(chunk[start:end]):
+                    used += len(segment) + 1
+                    if frame is not None:
+                        # like _read_frame, bytes after the terminator are dropped
+                        return frame, True, bytes(raw[: used - 1])
+                    if corrupted is None and len(segment) >= STRAY_LENGTH:
+                        corrupted = segment, used
+                start = end
+            if corrupted is not None and not self._serial.in_waiting:
+                # nothing more to look through: the corrupted one is the reply
+                segment, end = corrupted
+                return segment, True, bytes(raw[: end - 1])
+            if not chunk or time.monotonic() >= deadline:
+                return assembler.pending, False, bytes(raw)
 
     # ------------------------------------------------------------------
     # command interface (any thread)
     # ------------------------------------------------------------------
 
+    # I/O scheduling classes, most urgent first. Closing the slit and
+    # stopping the dome must never sit behind a backlog of STATUS polls and
+    # lamp commands; moves come next, then status and housekeeping.
+    _io_classes = ("safety", "motion", "status")
+    _safety_commands = frozenset({"MEADE TRAPEIRA FECHAR", "MEADE PROG PARAR"})
+    _motion_prefixes = ("MEADE DOMO MOVER", "MEADE PROG RESET", "MEADE TRAPEIRA ABRIR")
+
+    @classmethod
+    def _io_priority(cls, cmd):
+        """Index of cmd's scheduling class in _io_classes."""
+        if cmd in cls._safety_commands:
+            return 0
+        if cmd.startswith(cls._motion_prefixes):
+            return 1
+        return 2
+
+    def _enqueue(self, item, priority):
+        self._io_queue.put((priority, next(self._io_sequence), time.monotonic(), item))
+        if priority == 0:
+            # a sequence pausing on the worker runs it (see _pause)
+            self._urgent.set()
+
+    def queue_wait_stats(self):
+        """
+        Time commands spent queued for the I/O worker, per scheduling class:
+        {class: {"count", "mean", "max"}} in seconds.
+        """
+        stats = {name: [0, 0.0, 0.0] for name in self._io_classes}
+        for labels, wait in self._metrics.family("queue_wait_seconds").items():
+            total = stats[dict(labels)["io_class"]]
+            total[0] += wait.count
+            total[1] += wait.sum
+            total[2] = max(total[2], wait.max)
+        return {
+            name: {
+                "count": count,
+                "mean": seconds / count if count else 0.0,
+                "max": longest,
+            }
+            for name, (count, seconds, longest) in stats.items()
+        }
+
+    def dropped_command_stats(self):
+        """
+        Queued commands the I/O worker discarded without sending them:
+        {"cancelled": n, "expired": n}.
+        """
+        return {
+            reason: int(
+                self._metrics.counter("dropped_commands_total", reason=reason).value
+            )
+            for reason in ("cancelled", "expired")
+        }
+
+    def status_frame_stats(self):
+        """
+        What the STATUS frame assembler made of the replies read so far:
+        {"clean", "salvaged", "corrupted", "stray", "discarded_bytes"}
+        (see util.frames.StatusFrameAssembler).
+        """
+        return self._frames.stats()
+
+    # read-only commands: one transaction can answer every caller waiting
+    # for it, so concurrent requests share it (see _submit)
+    _coalesced_commands = frozenset({"MEADE PROG STATUS"})
+
+    def _submit(self, cmd, budget):
+        """
+        Queue cmd to the I/O worker. Returns (future, owner): the Future of
+        its reply, and whether this call queued it (False when it joined a
+        transaction already in flight).
+        """
+        if cmd not in self._coalesced_commands:
+            future = Future()
+            self._enqueue(
+                (cmd, future, time.monotonic() + budget), self._io_priority(cmd)
+            )
+            return future, True
+        with self._in_flight_lock:
+            future = self._in_flight.get(cmd)
+            if future is not None:
+                self._metrics.counter("coalesced_requests_total").inc()
+                return future, False
+            future = self._in_flight[cmd] = Future()
+            # registered before the worker can see the Future, so it runs
+            # on the worker thread when the reply is set
+            future.add_done_callback(lambda done: self._in_flight_done(cmd, done))
+            self._enqueue(
+                (cmd, future, time.monotonic() + budget), self._io_priority(cmd)
+            )
+            return future, True
+
+    def _in_flight_done(self, cmd, future):
+        with self._in_flight_lock:
+            if self._in_flight.get(cmd) is future:
+                del self._in_flight[cmd]
+
     def _command(self, cmd, deadline=None):
         """
         Queue cmd to the I/O worker and wait for the reply. Never raises:
@@ -336,13 +1016,19 @@ class DomeLNA(DomeBase, LampBase):
         treats as a missing ACK.
         """
         budget = self["io_deadline"] if deadline is None else deadline
-        future = Future()
-        self._io_queue.put((cmd, future, time.monotonic() + budget))
+        future, owner = self._submit(cmd, budget)
         try:
-            return future.result(timeout=budget + 2 * self["serial_timeout"])
+            return future.result(timeout=budget + 2 * self._reply_bounds(cmd)[1])
         except TimeoutError:
+            if owner:
+                # nobody waits for it any more: the worker drops it unsent
+                # (a no-op if the transaction is already on the wire)
+                future.cancel()
             self.log.warning(f"Dome did not answer '{cmd}' in time.")
             return ""
+        except CancelledError:
+            # joined a shared transaction whose owner gave up on it
+            return ""
 
     def _command_with_retries(self, cmd, tries=None):
         """Send cmd until the dome ACKs it. Returns True on ACK."""
@@ -351,22 +1037,58 @@ class DomeLNA(DomeBase, LampBase):
             if "ACK" in self._command(cmd):
                 return True
             if attempt + 1 < tries:
+                self._metrics.counter(
+                    "command_retries_total", command=self._rtt_key(cmd)
+                ).inc()
                 time.sleep(self["retry_delay"])
         return False
 
-    def _reset_dome(self, reset_tag=None):
-        # Reset the queue and restart the controller.
-        self._command_with_retries("MEADE PROG PARAR")
-        self._command_with_retries("MEADE PROG RESET")
-        # the controller needs a moment to come back before it takes a move
-        time.sleep(self["retry_delay"])
-
-        if reset_tag is None:
-            return
+    def _sequence(self, steps):
+        """
+        Run steps back to back on the I/O worker, as one queue item: no
+        other traffic interleaves (safety commands excepted, see _pause)
+        and no step waits for a queue round trip. Steps are (kind, arg):
+
+            ("command", cmd)      send cmd until ACKed (_restart_tries)
+            ("answer", seconds)   poll STATUS until the controller answers
+            ("idle", seconds)     poll STATUS until it reports idle
+            ("sleep", seconds)
+
+        Returns True when every step succeeded; the sequence stops at the
+        first one that did not, or when a safety PARAR ran in between (the
+        operator stopped the dome). Never raises.
+        """
+        steps = tuple(steps)
+        budget = sum(
+            self["io_deadline"] if kind == "command" else arg for kind, arg in steps
+        )
+        future = Future()
+        # motion class: a safety command queued behind it still runs at
+        # the sequence's next pause
+        self._enqueue((steps, future, time.monotonic() + budget), 1)
+        try:
+            return future.result(timeout=budget + 2 * self["serial_timeout"])
+        except TimeoutError:
+            future.cancel()
+            self.log.warning("Dome did not complete a command sequence in time.")
+            return False
 
-        # When resetting the dome, move it to the reset_tag
-        self._command_with_retries(f"MEADE DOMO MOVER = {reset_tag:03d}")
-        self._wait_idle(time.monotonic() + self["slew_timeout"])
+    def _reset_dome(self, reset_tag=None):
+        # Reset the queue and restart the controller, then move it to the
+        # reset_tag; one sequence, so nothing else reaches the port between
+        # the steps. Once RESET is ACKed, the controller is ready for a move
+        # as soon as it answers STATUS again.
+        steps = [
+            ("command", "MEADE PROG PARAR"),
+            ("command", "MEADE PROG RESET"),
+            ("answer", self["serial_timeout"]),
+        ]
+        if reset_tag is not None:
+            steps += [
+                ("command", f"MEADE DOMO MOVER = {reset_tag:03d}"),
+                ("idle", self["slew_timeout"]),
+            ]
+        return self._sequence(steps)
 
     # A well-formed STATUS frame: 8 spaces, 3-digit tag, space, '*' and 16
     # status bits. Motor EMI corrupts single bytes while the dome moves, so
@@ -386,10 +1108,13 @@ class DomeLNA(DomeBase, LampBase):
         if m and 801 <= int(m.group(1)) <= 982:
             tag, busy = int(m.group(1)), m.group(2)[3] == "1"
             self._status_cache = (tag, busy, time.monotonic())
+            self._init_state = "ready"
             return tag, busy
         if self._status_blank_re.match(ack):
+            self._request_init()
             return "blank"
         if ack:
+            self._metrics.counter("corrupted_frames_total").inc()
             self.log.debug(f"Discarding invalid dome status frame ({ack!r}).")
         return None
 
@@ -408,22 +1133,46 @@ class DomeLNA(DomeBase, LampBase):
 
     def _wait_idle(self, deadline):
         """Poll until the controller is idle. Returns False on timeout."""
-        while not self._check_idle():
-            if time.monotonic() >= deadline:
+        return self._wait_arrival(deadline) is not None
+
+    def _wait_arrival(self, deadline, eta=None, margin=0.0):
+        """
+        Poll until the controller is idle. Returns when it got there, or
+        None on timeout: the monotonic midpoint between the last busy and
+        the first idle poll, or the first idle poll alone when those are
+        further apart than two poll intervals (a wait for an ETA that came
+        after the actual arrival). The upper bound then pulls a model that
+        overestimates slew times back down.
+
+        Polls every poll_interval; given a predicted arrival (eta), not
+        before eta - margin: a slew is then a few polls around its arrival
+        instead of one per poll_interval all the way.
+        """
+        last_busy = time.monotonic()
+        if eta is not None:
+            if self._slew_sleep(min(eta - margin, deadline) - last_busy):
+                return None
+        while True:
+            polled = time.monotonic()
+            idle = self._check_idle()
+            self._slew_polled()
+            if idle:
+                idle_at = time.monotonic()
+                if idle_at - last_busy > 2 * self["poll_interval"]:
+                    return idle_at
+                return (last_busy + idle_at) / 2
+            last_busy = polled
+            now = time.monotonic()
+            if now >= deadline:
                 self.log.debug("Timed out waiting for the dome to become idle.")
-                return False
-            time.sleep(self["poll_interval"])
-        return True
+                return None
+            if self._slew_sleep(min(self["poll_interval"], deadline - now)):
+                return None
 
-    def _debug(self, msg):
-        if self._debug_log:
-            print(
-                time.time(),
-                threading.current_thread().name,
-                msg,
-                file=self._debug_log,
-            )
-            self._debug_log.flush()
+    def _debug(self, event, cmd="", detail=""):
+        """Trace one event to dome-debug.log (buffered: never blocks)."""
+        if self._trace is not None:
+            self._trace.record(event, cmd, detail)
 
     def switch_on(self):
         ret = self._command_with_retries("MEADE FLAT_WEAK LIGAR")
@@ -499,10 +1248,8 @@ class DomeLNA(DomeBase, LampBase):
             if isinstance(status, tuple):
                 return float(status[0])
             if status == "blank":
-                self.log.info("Initializing dome...")
-                self._init_dome()
-                time.sleep(self["poll_interval"])
-                continue
+                # no position until the background initialization ran
+                break
             if not self._io_healthy:
                 # the link is down and healing in the background: retrying
                 # here only delays the caller
@@ -525,11 +1272,19 @@ class DomeLNA(DomeBase, LampBase):
         else:
             return int(math.ceil(az / 2.0 + 846))
 
+    @property
+    def _status_cache_ttl(self):
+        # while the link is up the poller refreshes the frame at least every
+        # idle_poll_interval, plus the transaction in progress
+        return self["idle_poll_interval"] + self["serial_timeout"]
+
     def _cached_status(self):
         """Return the last (tag, busy) if fresher than the TTL, else None."""
         cached = self._status_cache
         if cached and (time.monotonic() - cached[2]) <= self._status_cache_ttl:
+            self._metrics.counter("status_cache_requests_total", result="hit").inc()
             return cached[0], cached[1]
+        self._metrics.counter("status_cache_requests_total", result="miss").inc()
         return None
 
     def _read_status(self):
@@ -542,9 +1297,11 @@ class DomeLNA(DomeBase, LampBase):
         if cached is not None:
             return cached
         if self._io_healthy:
-            tag = self._get_tag()
-            if tag is not None:
-                return tag, self._status_cache[1]
+            # one attempt: the poller already failed to refresh the frame,
+            # retrying here would only make the caller wait
+            status = self._get_status()
+            if isinstance(status, tuple):
+                return status
         if self._status_cache is not None:
             return self._status_cache[0], self._status_cache[1]
         return None, False
@@ -565,17 +1322,175 @@ class DomeLNA(DomeBase, LampBase):
         _, busy = self._read_status()
         return busy
 
+    def is_initialized(self):
+        """
+        False while the controller reports no position (blank tag field) and
+        the driver initializes it in the background.
+        """
+        return self._init_state not in ("uninitialized", "initializing")
+
+    def _request_init(self):
+        """
+        The controller answered a blank tag: initialize it on a background
+        thread (any thread may see the frame, none may block on the reset),
+        at most once per slew_timeout.
+        """
+        if self._init_state != "initializing":
+            self._init_state = "uninitialized"
+        with self._init_lock:
+            if (self._init_thread is not None and self._init_thread.is_alive()) or (
+                time.monotonic() < self._next_init
+            ):
+                return
+            self._next_init = time.monotonic() + self["slew_timeout"]
+            self._init_thread = threading.Thread(
+                target=self._init_dome, name="DomeLNA-init", daemon=True
+            )
+            self._init_thread.start()
+
     def _init_dome(self):
         if not self._acquire_motion():
             self.log.warning("Dome busy: skipping initialization.")
             return
         try:
-            self._debug("Initializing dome...")
-            self._reset_dome(reset_tag=self._park_tag)
-            self.log.info("Dome initialized.")
+            self.log.info("Initializing dome...")
+            self._init_state = "initializing"
+            self._debug("init", detail="initializing dome")
+            if self._reset_dome(reset_tag=self._park_tag):
+                self.log.info("Dome initialized.")
+            else:
+                self.log.warning(
+                    "Dome initialization failed; "
+                    "the next blank status frame retries it."
+                )
         finally:
+            if self._init_state == "initializing":
+                # still no tag: the next blank frame asks again
+                self._init_state = "uninitialized"
             self._motion_lock.release()
 
+    _metrics_help = {
+        "queue_wait_seconds": "Time commands waited for the I/O worker.",
+        "serial_rtt_seconds": "Serial round trip of answered commands.",
+        "reply_timeouts_total": "Commands the dome did not answer in time.",
+        "serial_retries_total": "Transactions retried after a reconnect.",
+        "command_retries_total": "Commands re-sent for lack of an ACK.",
+        "reconnects_total": "Serial port reopen attempts.",
+        "corrupted_frames_total": "STATUS replies discarded as malformed.",
+        "status_segments_total": (
+            "Segments read for STATUS, by outcome: a breakdown, a corrupted "
+            "reply also counts in corrupted_frames_total."
+        ),
+        "status_discarded_bytes_total": "Garbage bytes dropped around STATUS frames.",
+        "coalesced_requests_total": "STATUS requests answered by a shared transaction.",
+        "dropped_commands_total": "Queued commands dropped unsent.",
+        "status_polls_total": "Background STATUS polls.",
+        "status_cache_requests_total": "Status reads by cache outcome.",
+        "cache_hit_ratio": "Hit ratio of the status and lookup-table caches.",
+        "link_up": "1 while the dome answers on the serial port.",
+        "link_down_total": "Times the dome stopped answering.",
+        "unhealthy_seconds_total": "Time the dome spent not answering.",
+        "trace_records_dropped_total": "dome-debug.log records lost to a slow disk.",
+        "follow_moves_total": "Dome moves made following a tracking telescope.",
+        "follow_moves_per_hour": "Dome moves per hour of following.",
+        "follow_on_target_ratio": "Fraction of the following time on target.",
+        "kinematics_speed": "Learned dome speed (tags/s) outside the JOG zone.",
+        "kinematics_jog_speed": "Learned dome speed (tags/s) in the JOG zone.",
+        "kinematics_startup_seconds": "Learned delay before the dome starts moving.",
+        "kinematics_error_seconds": "RMS error of the predicted slew times.",
+        "recovery_seconds": "Failed slews: time from the reset to the target.",
+        "recovery_expected_seconds": "Failed slews: predicted recovery time.",
+    }
+
+    def get_metrics(self):
+        """
+        Latency and reliability metrics of the dome link: per-command queue
+        wait and serial round-trip histograms (seconds), retry, reconnect,
+        corrupted-frame and drop counters, cache hit ratios and time spent
+        unhealthy. {name: [{"labels": {...}, "value"} or {"labels": {...},
+        "count", "sum", "max", "p50", "p99", "buckets"}]}.
+        """
+        return self._metrics.snapshot()
+
+    def _collect_metrics(self):
+        down = self._unhealthy_seconds
+        since = self._unhealthy_since
+        if since is not None:
+            down += time.monotonic() - since
+        self._metrics.counter("unhealthy_seconds_total").set(down)
+        self._metrics.gauge("link_up").set(1.0 if self._io_healthy else 0.0)
+        trace = self._trace
+        if trace is not None:
+            self._metrics.counter("trace_records_dropped_total").set(trace.dropped)
+        model = self._kinematics.model()
+        self._metrics.gauge("kinematics_speed").set(model["speed"])
+        self._metrics.gauge("kinematics_jog_speed").set(model["jog_speed"])
+        self._metrics.gauge("kinematics_startup_seconds").set(model["startup"])
+        self._metrics.gauge("kinematics_error_seconds").set(model["error"])
+        follow = self._follow.stats()
+        self._metrics.counter("follow_moves_total").set(follow["moves"])
+        self._metrics.gauge("follow_moves_per_hour").set(follow["moves_per_hour"])
+        self._metrics.gauge("follow_on_target_ratio").set(follow["on_target_ratio"])
+        frames = self._frames.stats()
+        for result in ("clean", "salvaged", "corrupted", "stray"):
+            self._metrics.counter("status_segments_total", result=result).set(
+                frames[result]
+            )
+        self._metrics.counter("status_discarded_bytes_total").set(
+            frames["discarded_bytes"]
+        )
+        lookup = self._tag_cache.stats()
+        for cache, hits, misses in (
+            (
+                "status",
+                self._metrics.counter(
+                    "status_cache_requests_total", result="hit"
+                ).value,
+                self._metrics.counter(
+                    "status_cache_requests_total", result="miss"
+                ).value,
+            ),
+            ("lookup", lookup["hits"], lookup["misses"]),
+        ):
+            requests = hits + misses
+            self._metrics.gauge("cache_hit_ratio", cache=cache).set(
+                hits / requests if requests else 0.0
+            )
+
+    def _start_metrics_file(self):
+        if not self["metrics_file"]:
+            return
+        self._metrics_stop.clear()
+        self._metrics_thread = threading.Thread(
+            target=self._metrics_file_loop, name="DomeLNA-metrics", daemon=True
+        )
+        self._metrics_thread.start()
+
+    def _stop_metrics_file(self):
+        if self._metrics_thread is None:
+            return
+        self._metrics_stop.set()
+        self._metrics_thread.join()
+        self._metrics_thread = None
+
+    def _metrics_file_loop(self):
+        while True:
+            stopping = self._metrics_stop.wait(self["metrics_interval"])
+            try:
+                self._metrics.write_prometheus(self["metrics_file"])
+            except OSError as e:
+                self.log.warning(f"Could not write dome metrics ({e}).")
+            if stopping:
+                return
+
+    def reload_dome_model(self):
+        """
+        Pick up a changed dome model CSV: reload the lookup table and drop
+        every memoized tag computed from the old one.
+        """
+        self._lookup.reload()
+        self._tag_cache.invalidate()
+
     def _get_tracking_telescope(self):
         """
         Returns a proxy of the telescope if it is available and tracking,
@@ -598,21 +1513,65 @@ class DomeLNA(DomeBase, LampBase):
             self.log.debug(f"Telescope not available ({e}). Using geometric model.")
             return None
 
-    def _target_tag(self, az):
+    def _target_tags(self, az):
         """
-        Dome tag for a telescope pointing: from the empirical lookup table
-        when the telescope is tracking (the LNA telescope is off the dome
-        axis), from the geometric model otherwise.
+        Dome tags for a telescope pointing: (tag, lead tag, following). The
+        tag comes from the empirical lookup table when the telescope is
+        tracking (the LNA telescope is off the dome axis), from the
+        geometric model otherwise. Only then, `following`, can the dome be
+        placed ahead of the beam: the lead tag is where to move it (see
+        _lead_tag), the tag where it has to be now.
         """
         telescope = self._get_tracking_telescope()
         if telescope is None:
-            return self._az_to_tag(az)
+            tag = self._az_to_tag(az)
+            return tag, tag, False
         try:
             alt, telescope_az = telescope.get_position_alt_az()
-            return self._lookup.get_tag_altaz(alt, telescope_az)
+            tag = self._tag_cache.get_tag_altaz(alt, telescope_az)
+            return tag, self._lead_tag(alt, telescope_az, tag), True
         except Exception as e:
             self.log.warning(f"Could not use the dome lookup table ({e}).")
-            return self._az_to_tag(az)
+            tag = self._az_to_tag(az)
+            return tag, tag, False
+
+    def _lead_tag(self, alt, az, tag):
+        """
+        Where to place the dome for a beam on tag: of the tags that cover
+        it now (within dome_precision), the one that keeps covering it the
+        longest along the next follow_lead seconds of the tracked path. The
+        dome ends up ahead of the beam, which then crosses the whole slit
+        before the next move instead of half of it. tag itself when
+        follow_lead is 0.
+        """
+        lead = self["follow_lead"]
+        if lead <= 0:
+            return tag
+        ahead = [
+            self._tag_cache.get_tag_altaz(*pointing)
+            for pointing in lead_path(alt, az, self["site_latitude"], lead)
+        ]
+        precision = self._dome_precision
+        best, best_cover = tag, -1
+        # nearest candidates first: ties keep the dome closest to the beam
+        for offset in sorted(range(-precision, precision + 1), key=abs):
+            candidate = (tag - 801 + offset) % 180 + 801
+            cover = 0
+            for future in ahead:
+                if self._tag_distance(candidate, future) > precision:
+                    break
+                cover += 1
+            if cover > best_cover:
+                best, best_cover = candidate, cover
+        return best
+
+    def follow_stats(self):
+        """
+        How the dome followed the tracking telescope: {"moves",
+        "following_seconds", "moves_per_hour", "on_target_ratio"} (see
+        util.follow.FollowStats).
+        """
+        return self._follow.stats()
 
     def _on_target(self, dome_tag, precision):
         tag_now = self._get_tag()
@@ -629,55 +1588,325 @@ class DomeLNA(DomeBase, LampBase):
         unreachable keeps being retried instead of aborting the exposure
         (or the whole program) that asked for the sync.
         """
+        return self._run_slew(self._new_slew(az), self["motion_wait"])
+
+    def slew_to_az_async(self, az):
+        """
+        Start moving the dome and return at once, with the slew's id for
+        slew_progress() and cancel_slew(); slew_handle() gives in-process
+        callers progress callbacks and a wait. A slew started while another
+        slew runs takes the dome over (see _hand_over); while another
+        motion runs, it waits for it, up to slew_timeout.
+        """
+        slew = self._new_slew(az)
+        threading.Thread(
+            target=self._run_slew,
+            args=(slew, self["slew_timeout"]),
+            name=f"DomeLNA-slew-{slew.id}",
+            daemon=True,
+        ).start()
+        return slew.id
+
+    def slew_handle(self, slew_id):
+        """The SlewHandle of a recent slew (see util.slew), or None."""
+        with self._slews_lock:
+            return self._slews.get(slew_id)
+
+    def slew_progress(self, slew_id):
+        """
+        Progress of a recent slew: {"id", "az", "state", "target_tag",
+        "tag", "eta", "attempts", "elapsed", "result"} (see
+        util.slew.SlewHandle.progress), or None for an unknown id.
+        """
+        slew = self.slew_handle(slew_id)
+        return slew.progress() if slew is not None else None
+
+    def cancel_slew(self, slew_id=None):
+        """
+        Cancel a slew (if slew_id is None, the running one and any slew
+        handed over to it): a waiting slew never starts, a running one
+        stops the dome where it is. Returns False when there is no such
+        slew or it had already ended.
+        """
+        if slew_id is not None:
+            slew = self.slew_handle(slew_id)
+            return slew is not None and slew.cancel()
+        cancelled = False
+        for slew in self._running_slews():
+            cancelled = slew.cancel() or cancelled
+        return cancelled
+
+    def _running_slews(self):
+        """
+        The slew handed over to the running one (if any), then the running
+        one: in that order, so cancelling them never lets the running slew
+        start its successor in between.
+        """
+        with self._slews_lock:
+            return [s for s in (self._successor, self._active_slew) if s is not None]
+
+    # slews kept for slew_progress once they ended
+    _slews_kept = 32
+
+    def _new_slew(self, az):
         if az > 360:
             raise InvalidDomePositionException(
                 f"Cannot slew to {az}. Outside azimuth limits."
             )
-        if not self._acquire_motion():
-            self.log.warning(f"Dome busy: cannot slew to {az} right now.")
+        slew = SlewHandle(az, on_cancel=self._stop_cancelled)
+        with self._slews_lock:
+            self._slews[slew.id] = slew
+            # the oldest finished ones go, wherever they are: a slew still
+            # waiting or moving is never forgotten
+            excess = len(self._slews) - self._slews_kept
+            if excess > 0:
+                ended = [old.id for old in self._slews.values() if old.done]
+                for slew_id in ended[:excess]:
+                    del self._slews[slew_id]
+        return slew
+
+    def _stop_cancelled(self, slew):
+        """
+        SlewHandle cancel hook: stop the dome if slew is the one moving it,
+        the one PARAR of a cancel. Any other slew (not started yet, or
+        joined to the running one, see _join) just ends.
+        """
+        if slew is self._active_slew:
+            self._command_with_retries("MEADE PROG PARAR")
+        else:
+            slew.finish(False)
+
+    def _run_slew(self, slew, wait):
+        """
+        Run slew once the motion lock is free, waiting up to wait seconds
+        for it, or hand it over to the slew already running. Returns (and
+        finishes the handle with) the slew's result.
+        """
+        if self._hand_over(slew):
+            return bool(slew.wait())
+        if not self._motion_lock.acquire(timeout=wait):
+            if not slew.cancelled:
+                self.log.warning(f"Dome busy: cannot slew to {slew.az} right now.")
+            slew.finish(False)
             return False
+        previous = self._active_slew
+        first, retarget = slew, False
         try:
-            return self._do_slew_to_az(az)
-        except Exception as e:
-            self.log.exception(f"Dome slew to {az} failed ({e}).")
-            return False
+            while slew is not None:
+                self._active_slew = slew
+                result = False
+                try:
+                    if not slew.cancelled:
+                        slew.update(state=MOVING)
+                        result = self._do_slew_to_az(slew.az, retarget)
+                    elif retarget:
+                        # the dome still heads for the superseded target
+                        self._command_with_retries("MEADE PROG PARAR")
+                except Exception as e:
+                    self.log.exception(f"Dome slew to {slew.az} failed ({e}).")
+                # a slew handed over meanwhile goes next, from wherever this
+                # one left the dome (still moving, if it gave up for it)
+                with self._slews_lock:
+                    successor, self._successor = self._successor, None
+                    self._active_slew = successor or previous
+                # a cancelled slew was stopped by whoever cancelled it
+                retarget = (
+                    successor is not None and slew.superseded and not slew.cancelled
+                )
+                slew.finish(result)
+                slew = successor
         finally:
             self._motion_lock.release()
+        return first.wait(0)
+
+    def _hand_over(self, slew):
+        """
+        Latest target wins: if a slew is running, make slew its successor
+        instead of queueing it behind the motion lock. The running slew
+        gives up (superseded) and the same thread sends the dome on to the
+        new target, stopping it and moving it again in one sequence (see
+        _retarget) instead of finishing an obsolete move first. A successor
+        not started yet is itself superseded by a newer one.
+
+        A slew to the very tag the running slew heads for is no newer
+        target: it joins the running slew instead (see _join), and the
+        dome is neither stopped nor moved again.
+        """
+        if self._active_slew is None:
+            return False
+        # outside the lock: following a telescope asks it where it points
+        dome_tag = self._target_tags(slew.az)[1]
+        with self._slews_lock:
+            active = self._active_slew
+            if active is None or active.cancelled:
+                return False
+            joins = (
+                self._successor is None
+                and not active.superseded
+                and active.progress()["target_tag"] == dome_tag
+            )
+            if not joins:
+                pending, self._successor = self._successor, slew
+                active.supersede()
+        if joins:
+            self._join(slew, active)
+            self.log.debug(f"Slew to {slew.az} joined the running one.")
+            return True
+        if pending is not None:
+            pending.supersede()
+            pending.finish(False)
+        self.log.debug(f"Slew to {active.az} redirected to {slew.az}.")
+        return True
+
+    @staticmethod
+    def _join(slew, active):
+        """
+        Make slew follow the running slew active, which moves the dome to
+        the same tag: it mirrors active's progress and ends with its
+        result. Cancelling slew ends only slew (the dome goes on for the
+        other caller); cancelling active cancels both.
+        """
+
+        def follow(progress):
+            if progress["state"] in FINAL_STATES:
+                if progress["state"] == CANCELLED:
+                    slew.cancel(stop=False)
+                slew.finish(progress["result"])
+                return
+            slew.update(
+                state=MOVING,
+                **{
+                    field: progress[field]
+                    for field in ("target_tag", "tag", "eta", "attempts")
+                },
+            )
+
+        active.on_progress(follow)
+
+    def _retarget(self, dome_tag):
+        """
+        Stop the dome and send it to dome_tag, as one sequence: the
+        controller NAKs MOVER while it moves, and nothing else may reach it
+        between the stop and the new move. Returns whether it took the move.
+
+        The inverter ramps down before the controller reports idle; nothing
+        models how long that takes, so the stop gets a whole slew_timeout.
+        """
+        return self._sequence(
+            [
+                ("command", "MEADE PROG PARAR"),
+                ("idle", self["slew_timeout"]),
+                ("command", f"MEADE DOMO MOVER = {dome_tag:03d}"),
+            ]
+        )
+
+    def _slew_cancelled(self):
+        slew = self._active_slew
+        return slew is not None and slew.cancelled
+
+    def _slew_interrupted(self):
+        """The running slew was cancelled or superseded."""
+        slew = self._active_slew
+        return slew is not None and (slew.cancelled or slew.superseded)
+
+    def _slew_sleep(self, seconds):
+        """
+        Sleep, cut short (returning True) when the running slew is
+        cancelled or superseded.
+        """
+        slew = self._active_slew
+        if slew is None:
+            time.sleep(max(0.0, seconds))
+            return False
+        return slew.sleep(max(0.0, seconds))
 
-    def _do_slew_to_az(self, az):
+    def _slew_polled(self):
+        """Report the running slew's tag and ETA after a STATUS frame."""
+        slew = self._active_slew
+        cached = self._status_cache
+        if slew is None or cached is None:
+            return
+        target = slew.progress()["target_tag"]
+        eta = None
+        if target is not None:
+            eta = self._kinematics.slew_time(self._tag_distance(cached[0], target))
+        slew.update(tag=cached[0], eta=eta)
+
+    def _do_slew_to_az(self, az, retarget=False):
+        """
+        Slew to az (the active slew's target). retarget: the dome may still
+        be moving toward a superseded target; stop it on the way.
+        """
         if not self._io_healthy:
             # the worker is already reconnecting; spinning here would only
             # burn the slew timeout against a port that cannot answer
             self.log.warning(f"Dome is not answering: postponing the slew to {az}.")
             return False
 
-        dome_tag = self._target_tag(az)
+        tag, dome_tag, following = self._target_tags(az)
+        if self._active_slew is not None:
+            self._active_slew.update(target_tag=dome_tag)
 
         # Don't move (nor disturb the controller) if already on position.
-        if self._on_target(dome_tag, self._dome_precision):
+        on_target = self._on_target(tag, self._dome_precision)
+        if following:
+            self._follow.sample(on_target)
+        if on_target and not retarget:
             return True
 
         deadline = time.monotonic() + self["slew_timeout"]
         self.slew_begin(az)
 
         attempt = 0
-        while time.monotonic() < deadline:
+        recovery = None  # (started, expected seconds) of the last reset
+        while time.monotonic() < deadline and not self._slew_interrupted():
             attempt += 1
-            # MOVER is NAKed while the controller is busy: if a previous
-            # command left the dome moving, wait for it instead of
-            # triggering a reset.
-            self._wait_idle(deadline)
-
-            if not self._command_with_retries(f"MEADE DOMO MOVER = {dome_tag:03d}"):
+            if self._active_slew is not None:
+                self._active_slew.update(attempts=attempt)
+            if retarget:
+                retarget = False
+                if not self._retarget(dome_tag):
+                    # a slow stop is no NAK: go the ordinary way (wait for
+                    # idle, MOVER), which recovers only if MOVER fails
+                    continue
+                moved = True
+                # from where it stopped
+                cached = self._status_cache
+            else:
+                # MOVER is NAKed while the controller is busy: if a previous
+                # command left the dome moving, wait for it instead of
+                # triggering a reset.
+                self._wait_idle(deadline)
+                if self._slew_interrupted():
+                    break
+                cached = self._status_cache
+                moved = self._command_with_retries(f"MEADE DOMO MOVER = {dome_tag:03d}")
+            distance = self._tag_distance(cached[0], dome_tag) if cached else 0
+
+            if not moved:
                 self.log.debug("No ACK from dome when trying to slew. Restarting...")
-                self._reset_dome(self._recovery_tag(dome_tag))
+                recovery = self._recover(dome_tag)
                 continue
-
-            self._wait_idle(deadline)
+            if following:
+                self._follow.moved()
+
+            moved_at = time.monotonic()
+            self._slew_polled()
+            arrival = self._wait_slew(moved_at, distance, deadline)
+            if self._slew_interrupted():
+                # cancelled: the canceller stopped it (see _stop_cancelled);
+                # superseded: the next slew stops it on its way
+                break
 
             # If the position is off by more than restart_precision, restart
             # the dome and drive it to the target again.
             if self._on_target(dome_tag, self._restart_precision):
+                if arrival is not None and distance:
+                    self._kinematics.observe(distance, arrival - moved_at)
+                if recovery is not None:
+                    self._recovered(dome_tag, *recovery)
+                if following:
+                    self._follow.sample(True)
                 self.slew_complete(self.get_az(), DomeStatus.OK)
                 return True
 
@@ -685,15 +1914,60 @@ class DomeLNA(DomeBase, LampBase):
                 f"Dome position error >= {self._restart_precision} tags "
                 f"(attempt {attempt}). Restarting dome."
             )
-            self._reset_dome(self._recovery_tag(dome_tag))
+            recovery = self._recover(dome_tag)
 
-        self.log.warning(
-            f"Dome did not reach tag {dome_tag} within {self['slew_timeout']}s. "
-            "Will retry on the next control cycle."
-        )
+        if self._slew_cancelled():
+            self.log.info(f"Slew to tag {dome_tag} cancelled.")
+        elif self._slew_interrupted():
+            self.log.debug(f"Slew to tag {dome_tag} superseded by a newer target.")
+        else:
+            self.log.warning(
+                f"Dome did not reach tag {dome_tag} within {self['slew_timeout']}s. "
+                "Will retry on the next control cycle."
+            )
         self.slew_complete(self.get_az(), DomeStatus.ABORTED)
         return False
 
+    def _wait_slew(self, moved_at, distance, deadline):
+        """
+        Wait for a move of distance tags started at moved_at, polling
+        around the arrival the kinematics model predicts. Until then the
+        background poller keeps the cache fresh at its idle pace; from then
+        on the slew's own polls refresh it. Returns _wait_arrival's result.
+        """
+        if not distance or not self._kinematics.covers(distance):
+            # nothing to predict from yet: poll all the way, the model
+            # learns from these precise arrivals
+            return self._wait_arrival(deadline)
+        eta = moved_at + self._kinematics.slew_time(distance)
+        # early enough for a model that is a few error RMS off
+        margin = 2 * self["poll_interval"] + 3 * self._kinematics.error
+        self._slew_window = (eta - margin, deadline)
+        try:
+            return self._wait_arrival(deadline, eta, margin)
+        finally:
+            self._slew_window = None
+            # the worker may sleep until the window's end: reschedule the poller
+            self._enqueue(_WAKE, 2)
+
+    def estimate_slew_time(self, tag):
+        """
+        Seconds the dome needs to reach tag from where it is now, from the
+        learned kinematics (0.0 when already there), or None while its
+        position is unknown.
+        """
+        current, _ = self._read_status()
+        if current is None:
+            return None
+        return self._kinematics.slew_time(self._tag_distance(current, tag))
+
+    def kinematics_model(self):
+        """
+        The learned slew-time model: {"speed", "jog_speed" (tags/s),
+        "startup", "error" (s), "samples"} (see util.kinematics).
+        """
+        return self._kinematics.model()
+
     @staticmethod
     def _tag_distance(tag_a, tag_b):
         """
@@ -704,15 +1978,59 @@ class DomeLNA(DomeBase, LampBase):
         distance = abs(tag_a - tag_b) % 180
         return min(distance, 180 - distance)
 
-    @staticmethod
-    def _recovery_tag(dome_tag):
+    def _recovery_tag(self, dome_tag):
+        """
+        Tag used to reset the dome when a slew to dome_tag fails, and the
+        predicted seconds of the slews to it and back to dome_tag.
+
+        Of the tags at least recovery_approach tags away from dome_tag (the
+        retry needs a run-up), the one with the shortest predicted total
+        from where the dome is: on the way to dome_tag when the dome is far
+        from it, just past the run-up otherwise. With no position known,
+        100 tags before dome_tag.
+        """
+        slew_time = self._kinematics.slew_time
+        cached = self._status_cache
+        if cached is None:
+            reset_tag = dome_tag - 100
+            if reset_tag < 801:
+                reset_tag = 982 - (801 - reset_tag)
+            # from wherever the dome is: up to half a turn
+            return reset_tag, slew_time(90) + slew_time(80)
+        # no tag is further than half a turn from dome_tag
+        approach = min(self["recovery_approach"], 90)
+        best = None
+        for tag in range(801, 981):  # 981/982 are 801/802 again
+            retry = self._tag_distance(tag, dome_tag)
+            if retry < approach:
+                continue
+            expected = slew_time(self._tag_distance(cached[0], tag)) + slew_time(retry)
+            if best is None or expected < best[1]:
+                best = (tag, expected)
+        return best
+
+    def _recover(self, dome_tag):
         """
-        Tag used to reset the dome when a slew to dome_tag fails.
+        Reset the dome after a failed slew to dome_tag, on the recovery
+        tag. Returns (started, expected seconds) for _recovered.
         """
-        reset_tag = dome_tag - 100
-        if reset_tag < 801:
-            reset_tag = 982 - (801 - reset_tag)
-        return reset_tag
+        started = time.monotonic()
+        reset_tag, expected = self._recovery_tag(dome_tag)
+        self.log.info(
+            f"Recovering the slew to tag {dome_tag} through tag {reset_tag} "
+            f"(expected {expected:.1f}s)."
+        )
+        self._reset_dome(reset_tag)
+        return started, expected
+
+    def _recovered(self, dome_tag, started, expected):
+        actual = time.monotonic() - started
+        self.log.info(
+            f"Recovered the slew to tag {dome_tag} in {actual:.1f}s "
+            f"(expected {expected:.1f}s)."
+        )
+        self._metrics.histogram("recovery_seconds").observe(actual)
+        self._metrics.histogram("recovery_expected_seconds").observe(expected)
 
     def track(self):
         super().track()
@@ -720,7 +2038,10 @@ class DomeLNA(DomeBase, LampBase):
         time.sleep(15)
 
     def abort_slew(self):
-        """Stop the dome where it is (PARAR)."""
+        """Stop the dome where it is (PARAR), cancelling the running slew."""
+        for slew in self._running_slews():
+            # this PARAR stops the dome, not a second one from the cancel
+            slew.cancel(stop=False)
         return self._command_with_retries("MEADE PROG PARAR")
 
     def is_sync_with_tel(self):
@@ -734,11 +2055,13 @@ class DomeLNA(DomeBase, LampBase):
             if telescope is None:
                 return super().is_sync_with_tel()
             alt, telescope_az = telescope.get_position_alt_az()
-            dome_tag = self._lookup.get_tag_altaz(alt, telescope_az)
+            dome_tag = self._tag_cache.get_tag_altaz(alt, telescope_az)
             tag, _ = self._read_status()
             if tag is None:
                 return False
-            return self._tag_distance(tag, dome_tag) <= self._dome_precision
+            synced = self._tag_distance(tag, dome_tag) <= self._dome_precision
+            self._follow.sample(synced)
+            return synced
         except Exception as e:
             # answering "not synced" only picks a log line in the caller;
             # raising would abort the exposure asking the question
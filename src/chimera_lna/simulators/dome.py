@@ -27,6 +27,12 @@ import time
 
 MIN_TAG = 801
 MAX_TAG = 982
+# the controller drops the inverter to JOG this many tags from the target
+# (JOGSET in docs/cote_src/Main.c)
+JOG_ZONE = 12
+
+# DomeSimulator.respond(): drop the connection instead of answering
+_HANG_UP = object()
 
 
 class _DomeRequestHandler(socketserver.BaseRequestHandler):
@@ -45,12 +51,11 @@ class _DomeRequestHandler(socketserver.BaseRequestHandler):
                 buffer += data
                 while b"\r" in buffer:
                     line, _, buffer = buffer.partition(b"\r")
-                    response = simulator.process_command(line.decode().strip())
-                    if simulator.muted:
-                        # a hung/powered-off controller: the link is up and
-                        # writes succeed, nothing ever comes back
-                        continue
-                    self.request.sendall(f"{response}\r".encode())
+                    reply = simulator.respond(line.decode(errors="replace").strip())
+                    if reply is _HANG_UP:
+                        return
+                    if reply:
+                        self.request.sendall(reply)
         finally:
             simulator._connections.discard(self.request)
 
@@ -67,10 +72,14 @@ class DomeSimulator:
     The dome moves at `tags_per_second` and reports itself busy while moving,
     so clients see the same behavior as with the real hardware: an ACK to the
     move command followed by busy status polls until the position is reached.
+    Like the real controller it can take `start_delay` seconds to get going
+    and cover the last JOG_ZONE tags at the inverter's JOG speed,
+    `jog_tags_per_second` (by default, neither: a constant speed).
 
     Supported commands:
         MEADE PROG STATUS         -> "        nnn *bbbbbbbbbbbbbbbb" (tag at
-                                     [8:11], 16 status bits, busy at [16])
+                                     [8:11], 16 status bits, busy at [16]);
+                                     blank tag field until initialized
         MEADE PROG PARAR          -> stop movement
         MEADE PROG RESET          -> restart controller
         MEADE DOMO MOVER = NNN    -> move to tag NNN (801..982)
@@ -81,21 +90,35 @@ class DomeSimulator:
     Any other command is answered with NAK.
     """
 
-    def __init__(self, host="127.0.0.1", port=0, initial_tag=900, tags_per_second=5.0):
+    def __init__(
+        self,
+        host="127.0.0.1",
+        port=0,
+        initial_tag=900,
+        tags_per_second=5.0,
+        jog_tags_per_second=None,
+        start_delay=0.0,
+    ):
         self._host = host
         self._port = port
 
         self._lock = threading.Lock()
         self._position = float(initial_tag)
         self._target = float(initial_tag)
-        self._move_started = None
+        self._move_started = None  # last position update of a running move
+        self._motion_from = 0.0  # the move's start plus start_delay
         self.tags_per_second = tags_per_second
+        self.jog_tags_per_second = jog_tags_per_second
+        self.start_delay = start_delay
 
         self.slit_open = False
         self.lamp_on = False
         # when True the controller accepts commands and answers nothing
         # (powered-off / hung controller behind a healthy serial link)
         self.muted = False
+        # a controller that just powered up has no position (blank tag field
+        # in STATUS) until its first move
+        self.initialized = True
 
         self._server = None
         self._thread = None
@@ -150,14 +173,30 @@ class DomeSimulator:
         """Advance the dome position according to the elapsed move time."""
         if self._move_started is None:
             return
-        traveled = (time.monotonic() - self._move_started) * self.tags_per_second
-        distance = abs(self._target - self._position)
-        if traveled >= distance:
-            self._position = self._target
-            self._move_started = None
-        else:
-            self._position += math.copysign(traveled, self._target - self._position)
-            self._move_started = time.monotonic()
+        now = time.monotonic()
+        t = max(self._move_started, self._motion_from)
+        while t < now:
+            remaining = abs(self._target - self._position)
+            speed, stretch = self.tags_per_second, remaining
+            if self.jog_tags_per_second is not None:
+                if remaining > JOG_ZONE:
+                    stretch = remaining - JOG_ZONE
+                else:
+                    speed = self.jog_tags_per_second
+            if (now - t) * speed >= stretch:
+                # reaches the end of this stretch (the JOG zone or the target)
+                t += stretch / speed
+                self._position += math.copysign(stretch, self._target - self._position)
+                if stretch == remaining:
+                    self._position = self._target
+                    self._move_started = None
+                    return
+            else:
+                self._position += math.copysign(
+                    (now - t) * speed, self._target - self._position
+                )
+                break
+        self._move_started = now
 
     @property
     def current_tag(self):
@@ -173,6 +212,18 @@ class DomeSimulator:
 
     # protocol
 
+    def respond(self, command):
+        """
+        The bytes sent back for one command line: the reply and its "\r"
+        terminator, nothing (None) or _HANG_UP to drop the connection.
+        """
+        response = self.process_command(command)
+        if self.muted:
+            # a hung/powered-off controller: the link is up and writes
+            # succeed, nothing ever comes back
+            return None
+        return f"{response}\r".encode()
+
     def process_command(self, command):
         if command == "MEADE PROG STATUS":
             with self._lock:
@@ -182,6 +233,8 @@ class DomeSimulator:
             # Real controller frame: 8 spaces, 3-digit tag, ' *' and 16 status
             # bits. DomeLNA validates this layout strictly (busy bit at [16]).
             bits = f"00{int(not busy)}{int(busy)}" + "0" * 12
+            if not self.initialized:
+                return f"            *{bits}"
             return f"        {tag:03d} *{bits}"
 
         elif command == "MEADE PROG PARAR":
@@ -204,8 +257,10 @@ class DomeSimulator:
             with self._lock:
                 self._update_position()
                 self._target = float(target)
+                self.initialized = True
                 if self._target != self._position:
                     self._move_started = time.monotonic()
+                    self._motion_from = self._move_started + self.start_delay
             return "ACK"
 
         elif command == "MEADE TRAPEIRA ABRIR":
@@ -238,6 +293,18 @@ def main(args=None):
         default=5.0,
         help="dome speed (the real dome does ~5 tags/s)",
     )
+    parser.add_argument(
+        "--jog-tags-per-second",
+        type=float,
+        default=None,
+        help=f"speed over the last {JOG_ZONE} tags of a move (default: no JOG)",
+    )
+    parser.add_argument(
+        "--start-delay",
+        type=float,
+        default=0.0,
+        help="seconds between a move command and the dome starting to move",
+    )
     options = parser.parse_args(args)
 
     simulator = DomeSimulator(
@@ -245,6 +312,8 @@ def main(args=None):
         port=options.port,
         initial_tag=options.initial_tag,
         tags_per_second=options.tags_per_second,
+        jog_tags_per_second=options.jog_tags_per_second,
+        start_delay=options.start_delay,
     )
     simulator.start()
     print(f"LNA dome simulator listening on {simulator.device}")
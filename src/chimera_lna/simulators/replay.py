@@ -0,0 +1,118 @@
+# SPDX-FileCopyrightText: 2014-present William Schoenell <wschoenell@gmail.com>
+# SPDX-License-Identifier: GPL-2.0-or-later
+"""
+Replay a captured dome serial session (DomeLNA's `capture_file`).
+
+Serves the recorded replies back over the dome simulator's TCP protocol,
+with their recorded latency (or time-scaled by --speed): garbled frames,
+replies that never completed and controller stalls come back exactly as
+they happened that night, so a bad night becomes a deterministic
+regression case:
+
+    python -m chimera_lna.simulators.replay capture.jsonl --speed 10
+
+A capture rotated into segments is replayed whole, whichever of its files
+is given (see load_session).
+
+Each command is answered by the next recorded transaction for that same
+command. Commands the client sends more or fewer times than recorded
+(STATUS polls depend on timing) do not derail the replay: a command with
+no recorded transaction ahead is answered by the live simulator instead,
+and counted in `unmatched`.
+"""
+
+import argparse
+import time
+
+from chimera_lna.simulators.dome import _HANG_UP, DomeSimulator
+from chimera_lna.util.capture import load_session
+
+
+class ReplaySimulator(DomeSimulator):
+    """
+    DomeSimulator answering from a recorded session.
+
+    `speed` scales the recorded reply latencies (2.0: twice as fast; 0:
+    no delay at all). `lookahead` bounds how many recorded transactions
+    may be skipped to find the next one for a command.
+    """
+
+    def __init__(self, session, speed=1.0, lookahead=50, **kwargs):
+        super().__init__(**kwargs)
+        self.transactions = (
+            load_session(session) if isinstance(session, str) else list(session)
+        )
+        self.speed = speed
+        self.lookahead = lookahead
+        self.replayed = 0
+        self.skipped = 0
+        self.unmatched = 0
+        self._cursor = 0
+
+    @property
+    def finished(self):
+        return self._cursor >= len(self.transactions)
+
+    def _next_transaction(self, command):
+        with self._lock:
+            end = min(len(self.transactions), self._cursor + self.lookahead)
+            for index in range(self._cursor, end):
+                if self.transactions[index]["out"] == command:
+                    self.skipped += index - self._cursor
+                    self._cursor = index + 1
+                    self.replayed += 1
+                    return self.transactions[index]
+            self.unmatched += 1
+            return None
+
+    def respond(self, command):
+        transaction = self._next_transaction(command)
+        if transaction is None:
+            return super().respond(command)
+        if self.speed:
+            time.sleep(transaction["dur"] / self.speed)
+        if "error" in transaction:
+            # the port failed that night (USB drop): so does the link now
+            return _HANG_UP
+        reply = transaction["in"].encode("latin-1")
+        if transaction.get("complete", True):
+            reply += b"\r"
+        return reply
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description="Replay a captured dome session")
+    parser.add_argument(
+        "session",
+        help="DomeLNA capture_file, or any segment of it (.jsonl or .jsonl.gz)",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5001)
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="reply latency scale: 1 as recorded, 10 ten times faster, 0 none",
+    )
+    options = parser.parse_args(args)
+
+    simulator = ReplaySimulator(
+        options.session, speed=options.speed, host=options.host, port=options.port
+    )
+    simulator.start()
+    print(f"Replaying {len(simulator.transactions)} transactions on {simulator.device}")
+    try:
+        while not simulator.finished:
+            time.sleep(1)
+        print(
+            f"Replay finished: {simulator.replayed} replayed, "
+            f"{simulator.skipped} skipped, {simulator.unmatched} unmatched."
+        )
+    except KeyboardInterrupt:
+        pass
+    finally:
+        simulator.stop()
+
+
+if __name__ == "__main__":
+    main()
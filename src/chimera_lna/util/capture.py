@@ -0,0 +1,140 @@
+# SPDX-FileCopyrightText: 2014-present William Schoenell <wschoenell@gmail.com>
+# SPDX-License-Identifier: GPL-2.0-or-later
+"""Wire-level capture of dome serial sessions (see simulators.replay)."""
+
+import gzip
+import json
+import os
+import re
+import time
+
+from chimera_lna.util.trace import TraceLog
+
+FORMAT_VERSION = 1
+
+
+class SessionCapture(TraceLog):
+    """
+    Records every serial transaction as one JSON line:
+
+        {"t": 12.504311, "out": "MEADE PROG STATUS",
+         "in": "        900 *0010000000000000", "dur": 0.031}
+
+    `t` is when the command was written, in monotonic seconds since the
+    capture started; `dur` is how long the reply took (the whole timeout
+    when it never completed). `in` holds the reply bytes before the "\\r"
+    terminator, decoded as latin-1 so EMI-garbled bytes survive the round
+    trip exactly. `"complete": false` marks a reply that timed out (`in`
+    is then whatever arrived) and `"error"` a transaction that failed on
+    the port itself (a USB drop). Every file of a capture, the live one and
+    each segment rotated out of it, starts with a header:
+
+        {"session": "dome", "version": 1, "started": 1767225600.0,
+         "t": 3600.0, "wall": 1767229200.0}
+
+    `started` is the wall clock when the capture started, the same in all
+    the segments of one session; `t` and `wall` are when the file was
+    opened, on both clocks, so a segment can be placed on its own.
+
+    Buffered and written like TraceLog (never blocks the I/O worker); a
+    capture is rotated only when the file is found non-empty at start or
+    grows past `max_bytes`. load_session() reads a session back across
+    its segments.
+    """
+
+    def __init__(self, path, max_bytes=1024 * 1024 * 1024, **kwargs):
+        kwargs.setdefault("max_seconds", float("inf"))
+        super().__init__(path, max_bytes=max_bytes, **kwargs)
+        self._t0 = time.monotonic()
+        self._started = time.time()
+
+    def start(self):
+        self._t0 = time.monotonic()
+        self._started = time.time()
+        return super().start()
+
+    def _header(self):
+        return {
+            "session": "dome",
+            "version": FORMAT_VERSION,
+            "started": round(self._started, 6),
+            "t": round(time.monotonic() - self._t0, 6),
+            "wall": round(time.time(), 6),
+        }
+
+    def transaction(self, sent, out, reply, complete, duration, error=None):
+        """
+        Queue one transaction; `sent` is the monotonic time of the write,
+        `reply` the bytes read (without the terminator).
+        """
+        buffer = self._buffer
+        if len(buffer) == buffer.maxlen:
+            self.dropped += 1
+        buffer.append((sent - self._t0, out, bytes(reply), complete, duration, error))
+
+    def _entry(self, item):
+        if isinstance(item, dict):
+            return item
+        t, out, reply, complete, duration, error = item
+        entry = {
+            "t": round(t, 6),
+            "out": out,
+            "in": reply.decode("latin-1"),
+            "dur": round(duration, 6),
+        }
+        if not complete:
+            entry["complete"] = False
+        if error is not None:
+            entry["error"] = error
+        return entry
+
+
+# a rotated segment: <capture>.20260101-063000[-2][.gz] (see TraceLog)
+_SEGMENT_RE = re.compile(r"\.\d{8}-\d{6}(?:-\d+)?(?:\.gz)?\Z")
+
+
+def _entries(path):
+    opener = gzip.open if str(path).endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def _header(path):
+    """The header of a capture file, or None (empty, or not a capture)."""
+    entries = _entries(path)
+    try:
+        entry = next(entries, None)
+    except (OSError, ValueError):
+        return None
+    finally:
+        entries.close()
+    return entry if entry and "session" in entry else None
+
+
+def load_session(path):
+    """
+    The transactions of a capture session, oldest first. `path` is the
+    capture file or any segment rotated out of it (plain or gzipped): the
+    session's other segments lying next to it are read too, in order.
+    """
+    path = str(path)
+    header = _header(path)
+    files = [path]
+    if header is not None and "started" in header:
+        live = _SEGMENT_RE.sub("", path)
+        candidates = TraceLog(live).segments()
+        if os.path.exists(live):
+            candidates.append(live)
+        session = []
+        for candidate in candidates:
+            other = _header(candidate)
+            if other is not None and other.get("started") == header["started"]:
+                session.append((other.get("t", 0.0), candidate))
+        files = [f for _, f in sorted(session)]
+    transactions = []
+    for f in files:
+        transactions.extend(entry for entry in _entries(f) if "out" in entry)
+    return transactions
@@ -0,0 +1,177 @@
+# SPDX-FileCopyrightText: 2014-present William Schoenell <wschoenell@gmail.com>
+# SPDX-License-Identifier: GPL-2.0-or-later
+"""Watch a serial device node come and go (Linux inotify)."""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import threading
+
+# <sys/inotify.h>
+IN_ATTRIB = 0x00000004
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_ONLYDIR = 0x01000000
+
+_WATCH_MASK = (
+    IN_ATTRIB
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+    | IN_ONLYDIR
+)
+
+_libc = None
+
+
+def _inotify():
+    global _libc
+    if _libc is None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError(errno.ENOSYS, "inotify is not available on this system")
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [
+            ctypes.c_int,
+            ctypes.c_char_p,
+            ctypes.c_uint32,
+        ]
+        libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        _libc = libc
+    return _libc
+
+
+def _check(result):
+    if result < 0:
+        code = ctypes.get_errno()
+        raise OSError(code, os.strerror(code))
+    return result
+
+
+class DeviceWatch:
+    """
+    Tracks whether `path` exists, waking up on inotify events instead of
+    polling.
+
+    A USB serial adapter that re-enumerates removes its device node (and
+    the /dev/serial/by-id symlink to it) and creates it again moments
+    later. The watch is on the nearest existing ancestor directory of
+    `path`, so it also follows a parent that disappears with the device
+    (/dev/serial/by-id goes away with the last USB serial adapter).
+
+    `on_appear` is called from the watch thread every time `path` goes
+    from missing to present. Raises OSError when inotify is not available
+    (not Linux): callers fall back to timed retries.
+    """
+
+    def __init__(self, path, on_appear=None):
+        self.path = os.path.abspath(path)
+        self.on_appear = on_appear
+        libc = _inotify()
+        self._libc = libc
+        self._fd = _check(libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC))
+        self._wd = None
+        self._watched = None
+        # written to by stop() to wake the select()
+        self._wake_r, self._wake_w = os.pipe()
+        self._present = threading.Event()
+        self._stopped = False
+        self._thread = None
+        self._update()
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._run, name="DeviceWatch", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped = True
+        os.write(self._wake_w, b"\0")
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        for fd in (self._fd, self._wake_r, self._wake_w):
+            os.close(fd)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def exists(self):
+        return self._present.is_set()
+
+    def wait(self, timeout=None):
+        """Block until `path` exists, at most timeout seconds. Returns exists()."""
+        return self._present.wait(timeout)
+
+    def _watch_target(self):
+        """The nearest existing ancestor directory of `path`, and its inode."""
+        directory = os.path.dirname(self.path)
+        while True:
+            try:
+                st = os.stat(directory)
+                return directory, (st.st_dev, st.st_ino)
+            except FileNotFoundError:
+                directory = os.path.dirname(directory)
+
+    def _update(self):
+        """
+        Re-arm the watch on the right directory, then look at `path`.
+        Returns True when `path` appeared since the last look.
+        """
+        target = self._watch_target()
+        # compared with the inode too: a directory deleted and created again
+        # under the same name silently dropped the old watch
+        if target != self._watched:
+            if self._wd is not None:
+                self._libc.inotify_rm_watch(self._fd, self._wd)
+                self._wd = None
+            self._watched = None
+            self._wd = _check(
+                self._libc.inotify_add_watch(self._fd, target[0].encode(), _WATCH_MASK)
+            )
+            self._watched = target
+        # looked at after arming: a change in between is already queued
+        present = os.path.exists(self.path)
+        appeared = present and not self._present.is_set()
+        if present:
+            self._present.set()
+        else:
+            self._present.clear()
+        return appeared
+
+    def _drain(self):
+        while True:
+            try:
+                if not os.read(self._fd, 4096):
+                    return
+            except BlockingIOError:
+                return
+
+    def _run(self):
+        while not self._stopped:
+            try:
+                appeared = self._update()
+            except OSError:
+                # the directory vanished between finding and watching it, or
+                # no watch can be added: look again shortly
+                select.select([self._wake_r], [], [], 1.0)
+                continue
+            if appeared and self.on_appear is not None:
+                self.on_appear()
+            select.select([self._fd, self._wake_r], [], [])
+            # the events themselves do not matter, only what is on disk now
+            self._drain()
@@ -19,6 +19,10 @@ def calc_dome_az(ha, dec, phi, x0, y0, z0, dec_axis_length, dome_radius):
     """
     Calculates the corrected dome azimuth given the dome/telescope geometry.
 
+    ha and dec may be NumPy arrays (they are broadcast against each other):
+    the optical axis is intersected with the dome sphere in closed form, so
+    a whole night of pointings is one call.
+
     :param ha: Telescope hour-angle in radians
     :param dec: Telescope declination in radians
     :param phi: Telescope elevation of the polar axis (usually the site latitude) in radians
@@ -27,9 +31,12 @@ def calc_dome_az(ha, dec, phi, x0, y0, z0, dec_axis_length, dome_radius):
     :param z0: Telescope gravity center position Z. See dome_synchronisation.pdf on documentation.
     :param dec_axis_length: Distance along the declination axis from the gravity center to the optical axis
     :param dome_radius: Dome radius
-    :return dome_az: Corrected dome azimuth in radians.
+    :return dome_az: Corrected dome azimuth in radians, in [0, 2 pi).
     """
 
+    ha = np.asarray(ha, dtype=float)
+    dec = np.asarray(dec, dtype=float)
+
     # Calculate position of the optical axis origin with respect to dome center.
     x = x0 + dec_axis_length * np.cos(phi) * np.cos(ha)
     y = y0 - dec_axis_length * np.sin(phi) * np.sin(ha)
@@ -37,28 +44,23 @@ def calc_dome_az(ha, dec, phi, x0, y0, z0, dec_axis_length, dome_radius):
 
     # unit vector with the direction of the optical axis (to the object)
     # 1. if observatory is in the North hemisphere, -1. if South
-    pole_sign = 1.0 if phi > 0.0 else -1.0
-    dang = (np.pi / 2.0 + (pole_sign * dec)) - (pole_sign * phi)
-
-    vx = np.sin(ha) * np.sin(dang * np.pi / 180.0)
-    vy = np.cos(dang * np.pi / 180.0) + np.zeros_like(ha)
-    vz = np.cos(ha) * np.sin(dang * np.pi / 180.0) - np.cos(dang * np.pi / 180.0)
-
-    # find the distance along the optical axis where it crosses the dome sphere
-    path = np.linspace(dome_radius / 2.0, dome_radius * 2.0, 100)
-    res = (
-        (x + path * vx) ** 2.0
-        + (y + path * vy) ** 2.0
-        + (z + path * vz) ** 2.0
-        - dome_radius**2.0
-    )
-    crossing = path[res.argmin()]
+    pole_sign = np.where(np.asarray(phi) > 0.0, 1.0, -1.0)
+    dang = (np.pi / 2.0 + (pole_sign * dec)) - (pole_sign * phi)  # radians
 
-    v = np.arccos((z + crossing * vz) / dome_radius)
-    ux = np.arccos((x + crossing * vx) / (dome_radius * np.sin(v)))
-    dy = y + crossing * vy
+    vx = np.sin(ha) * np.sin(dang)
+    vy = np.cos(dang) + np.zeros_like(ha)
+    vz = np.cos(ha) * np.sin(dang) - np.cos(dang)
 
-    if dy < 0.0:
-        ux = 2.0 * np.pi - ux
+    # distance t along the optical axis where it crosses the dome sphere:
+    # |origin + t v|^2 = R^2, a quadratic in t. The origin is inside the dome,
+    # so the roots have opposite signs and the positive one is the crossing.
+    a = vx**2 + vy**2 + vz**2
+    half_b = x * vx + y * vy + z * vz
+    c = x**2 + y**2 + z**2 - dome_radius**2
+    discriminant = half_b**2 - a * c
+    if np.any(discriminant < 0.0):
+        raise CalcDomeError("The optical axis does not cross the dome.")
+    crossing = (np.sqrt(discriminant) - half_b) / a
 
-    return ux
+    # azimuth of the crossing point, measured like the dome: [0, 2 pi)
+    return np.arctan2(y + crossing * vy, x + crossing * vx) % (2.0 * np.pi)
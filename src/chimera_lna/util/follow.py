@@ -0,0 +1,100 @@
+# SPDX-FileCopyrightText: 2014-present William Schoenell <wschoenell@gmail.com>
+# SPDX-License-Identifier: GPL-2.0-or-later
+"""Where a tracking telescope will point, and how well the dome follows it."""
+
+import math
+import threading
+import time
+
+import numpy as np
+
+# radians per second of the sky around the celestial pole
+SIDEREAL_RATE = 2.0 * math.pi / 86164.0905
+
+
+def altaz_ahead(alt, az, latitude, seconds):
+    """
+    Where a telescope tracking at the sidereal rate and pointing at (alt,
+    az) now will point `seconds` from now (a scalar or an array). Angles in
+    degrees, azimuth from north through east; returns (alt, az) arrays
+    broadcast against seconds.
+
+    The pointing is rotated about the celestial pole axis, so no hour angle
+    or declination is needed, only the site latitude.
+    """
+    alt, az, phi = np.radians(alt), np.radians(az), np.radians(latitude)
+    # horizon frame: x north, y east, z up
+    v = np.array((np.cos(alt) * np.cos(az), np.cos(alt) * np.sin(az), np.sin(alt)))
+    pole = np.array((np.cos(phi), 0.0, np.sin(phi)))
+    # the sky turns westward: a positive rotation about the pole axis
+    theta = SIDEREAL_RATE * np.asarray(seconds, dtype=float)
+    cos_t, sin_t = np.cos(theta)[..., None], np.sin(theta)[..., None]
+    rotated = (
+        v * cos_t + np.cross(pole, v) * sin_t + pole * np.dot(pole, v) * (1 - cos_t)
+    )
+    x, y, z = np.moveaxis(rotated, -1, 0)
+    return (
+        np.degrees(np.arcsin(np.clip(z, -1.0, 1.0))),
+        np.degrees(np.arctan2(y, x)) % 360.0,
+    )
+
+
+def lead_path(alt, az, latitude, lead, steps=16):
+    """
+    The pointings of the next `lead` seconds, `steps` evenly spaced ones
+    after now: [(alt, az), ...], nearest first.
+    """
+    alts, azs = altaz_ahead(alt, az, latitude, np.linspace(lead / steps, lead, steps))
+    return [(float(a), float(z)) for a, z in zip(alts, azs)]
+
+
+class FollowStats:
+    """
+    How the dome follows a tracking telescope: the moves it made and the
+    time it spent on target, from on/off-target samples taken by the
+    control loop. Between two samples the first one's state holds; a gap
+    longer than `max_gap` seconds (the dome was not following) counts
+    toward neither.
+    """
+
+    def __init__(self, max_gap=300.0):
+        self.max_gap = max_gap
+        self._lock = threading.Lock()
+        self._last = None  # (monotonic time, on target)
+        self.moves = 0
+        self.following_seconds = 0.0
+        self.on_target_seconds = 0.0
+
+    def sample(self, on_target, now=None):
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if self._last is not None:
+                since, was_on_target = self._last
+                elapsed = now - since
+                if 0.0 < elapsed <= self.max_gap:
+                    self.following_seconds += elapsed
+                    if was_on_target:
+                        self.on_target_seconds += elapsed
+            self._last = (now, bool(on_target))
+
+    def moved(self):
+        with self._lock:
+            self.moves += 1
+
+    def stats(self):
+        """
+        {"moves", "following_seconds", "moves_per_hour",
+        "on_target_ratio"}; rates are 0.0 before any following time.
+        """
+        with self._lock:
+            hours = self.following_seconds / 3600.0
+            return {
+                "moves": self.moves,
+                "following_seconds": self.following_seconds,
+                "moves_per_hour": self.moves / hours if hours else 0.0,
+                "on_target_ratio": (
+                    self.on_target_seconds / self.following_seconds
+                    if self.following_seconds
+                    else 0.0
+                ),
+            }
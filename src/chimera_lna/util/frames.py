@@ -0,0 +1,91 @@
+# SPDX-FileCopyrightText: 2014-present William Schoenell <wschoenell@gmail.com>
+# SPDX-License-Identifier: GPL-2.0-or-later
+"""Reassembly of dome STATUS frames from a noisy serial byte stream."""
+
+import re
+
+# A STATUS frame at the end of a "\r"-terminated segment: 8 spaces and a
+# 3-digit tag (or 11 spaces: no tag yet), a space, '*' and 16 status bits.
+# Searched, not matched: bytes in front of it (EMI while the motors run, the
+# tail of a late reply to an earlier command) do not touch the frame itself.
+# Anything between the bits and the terminator does, as would an inserted
+# bit, so the frame has to end the segment.
+_FRAME_RE = re.compile(rb"(?: {8}\d{3}| {11}) \*[01]{16}\Z")
+
+# segments shorter than this are never a (corrupted) STATUS frame: a late
+# ACK/NAK, or a burst of noise
+STRAY_LENGTH = 8
+
+
+class StatusFrameAssembler:
+    """
+    Splits the bytes read from the port into "\\r"-terminated segments and
+    keeps the well-formed STATUS frames in them:
+
+        >>> frames = StatusFrameAssembler()
+        >>> frames.feed(b"ACK\\r\\x9a        900 *0010000000000000\\r")
+        [(None, b'ACK'), (b'        900 *0010000000000000', b'\\x9a        900 *0010000000000000')]
+
+    feed() returns one (frame, segment) pair per complete segment; frame is
+    None when no frame could be salvaged from it. A segment that merely
+    carries leading garbage gives up its frame ("salvaged") instead of
+    being thrown away with it; only frames corrupted themselves are lost.
+    Bytes after the last terminator are kept for the next feed().
+
+    Counts every segment by outcome (see stats()): "clean" frames,
+    "salvaged" frames, "corrupted" segments and "stray" ones (too short to
+    be a frame), plus the garbage bytes discarded.
+    """
+
+    def __init__(self):
+        self._pending = bytearray()
+        self.clean = 0
+        self.salvaged = 0
+        self.corrupted = 0
+        self.stray = 0
+        self.discarded_bytes = 0
+
+    @property
+    def pending(self):
+        """Bytes read since the last terminator."""
+        return bytes(self._pending)
+
+    def reset(self):
+        """Drop a partial segment (the port was flushed)."""
+        self._pending.clear()
+
+    def feed(self, data):
+        self._pending += data
+        results = []
+        while True:
+            end = self._pending.find(b"\r")
+            if end < 0:
+                return results
+            segment = bytes(self._pending[:end])
+            del self._pending[: end + 1]
+            results.append((self._extract(segment), segment))
+
+    def _extract(self, segment):
+        m = _FRAME_RE.search(segment)
+        if m is None:
+            if len(segment) < STRAY_LENGTH:
+                self.stray += 1
+            else:
+                self.corrupted += 1
+            self.discarded_bytes += len(segment)
+            return None
+        if m.start():
+            self.salvaged += 1
+            self.discarded_bytes += m.start()
+        else:
+            self.clean += 1
+        return m.group()
+
+    def stats(self):
+        return {
+            "clean": self.clean,
+            "salvaged": self.salvaged,
+            "corrupted": self.corrupted,
+            "stray": self.stray,
+            "discarded_bytes": self.discarded_bytes,
+        }
@@ -0,0 +1,141 @@
+# SPDX-FileCopyrightText: 2014-present William Schoenell <wschoenell@gmail.com>
+# SPDX-License-Identifier: GPL-2.0-or-later
+"""A slew-time model of the dome, learned from the slews it makes."""
+
+import collections
+import math
+import threading
+
+import numpy as np
+
+# From the firmware (docs/cote_src, JOGSET): within this many tags of the
+# target the controller drops the inverter to JOG, its low speed
+JOG_ZONE = 12
+
+
+class DomeKinematics:
+    """
+    Slew time for a distance of d tags:
+
+        startup + max(d - jog_zone, 0) / speed + min(d, jog_zone) / jog_speed
+
+    startup covers the controller reading the tag and the inverter ramping
+    up. The three parameters are refitted by least squares from the last
+    `window` observed (distance, seconds) slews, lightly pulled toward the
+    initial values: a model that has seen one kind of distance only keeps
+    the initial values for what those slews cannot tell, while the slews
+    decide everything they can.
+
+    The model is `trained` once it has seen `min_samples` slews, and
+    `error` is the RMS of recent prediction errors (each covered slew
+    predicted before it was learned): until then and that far, do not
+    trust an ETA, nor beyond the longest slew seen (see covers).
+    """
+
+    # weight of the pull toward the initial values, against 1 for each
+    # observed slew's squared error in seconds
+    _prior_weight = 1e-4
+
+    def __init__(
+        self,
+        speed=5.0,
+        jog_speed=2.0,
+        startup=1.0,
+        window=32,
+        min_samples=3,
+        jog_zone=JOG_ZONE,
+    ):
+        self.jog_zone = jog_zone
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+        self._samples = collections.deque(maxlen=window)
+        self._errors = collections.deque(maxlen=window)
+        self._prior = np.array((startup, 1.0 / speed, 1.0 / jog_speed))
+        self.startup, self.speed, self.jog_speed = startup, speed, jog_speed
+
+    def _time(self, distance, startup, speed, jog_speed):
+        fast = max(distance - self.jog_zone, 0)
+        return startup + fast / speed + min(distance, self.jog_zone) / jog_speed
+
+    def slew_time(self, distance):
+        """Predicted seconds to slew `distance` tags (0 for no move)."""
+        if distance <= 0:
+            return 0.0
+        with self._lock:
+            return self._time(distance, self.startup, self.speed, self.jog_speed)
+
+    @property
+    def trained(self):
+        with self._lock:
+            return len(self._samples) >= self.min_samples
+
+    def covers(self, distance):
+        """
+        Whether to trust slew_time(distance): trained, and on a distance
+        no longer than the longest slew seen (no extrapolation).
+        """
+        with self._lock:
+            return self._covers(distance)
+
+    def _covers(self, distance):
+        return len(self._samples) >= self.min_samples and any(
+            seen >= distance for seen, _ in self._samples
+        )
+
+    @property
+    def error(self):
+        with self._lock:
+            if not self._errors:
+                return 0.0
+            return math.sqrt(sum(e * e for e in self._errors) / len(self._errors))
+
+    def observe(self, distance, seconds):
+        """Learn from one slew of `distance` tags that took `seconds`."""
+        if distance <= 0 or seconds <= 0:
+            return
+        predicted = self.slew_time(distance)
+        with self._lock:
+            if self._covers(distance):
+                # the error of the ETAs actually used, not of the prior or
+                # of an extrapolation
+                self._errors.append(seconds - predicted)
+            self._samples.append((distance, seconds))
+            self._fit()
+
+    def _fit(self):
+        distance = np.array([d for d, _ in self._samples], dtype=float)
+        seconds = np.array([t for _, t in self._samples])
+        # linear in (startup, 1 / speed, 1 / jog_speed), plus one row per
+        # parameter for the pull toward its initial value
+        design = np.column_stack(
+            (
+                np.ones_like(distance),
+                np.maximum(distance - self.jog_zone, 0.0),
+                np.minimum(distance, self.jog_zone),
+            )
+        )
+        pull = math.sqrt(self._prior_weight)
+        (startup, pace, jog_pace), *_ = np.linalg.lstsq(
+            np.vstack((design, pull * np.eye(3))),
+            np.concatenate((seconds, pull * self._prior)),
+            rcond=None,
+        )
+        # a degenerate history (one distance only) can fit a negative term:
+        # keep the physically possible part of the fit
+        self.startup = max(float(startup), 0.0)
+        if pace > 0:
+            self.speed = 1.0 / float(pace)
+        if jog_pace > 0:
+            self.jog_speed = 1.0 / float(jog_pace)
+
+    def model(self):
+        """{"speed", "jog_speed" (tags/s), "startup", "error" (s), "samples"}."""
+        error = self.error
+        with self._lock:
+            return {
+                "speed": self.speed,
+                "jog_speed": self.jog_speed,
+                "startup": self.startup,
+                "error": error,
+                "samples": len(self._samples),
+            }
@@ -2,29 +2,213 @@
 # SPDX-License-Identifier: GPL-2.0-or-later
 """Dome tag lookup table for the LNA dome."""
 
+import hashlib
+import math
 import os
+import threading
+from collections import OrderedDict
 
 import numpy as np
 
 import chimera_lna
 
+MODEL_PATH = os.path.join(
+    os.path.dirname(chimera_lna.__file__), "data", "dome_model.csv"
+)
+
+
+def _raster_paths(model_path):
+    """Compiled raster of a model CSV and the digest of the CSV it was built from."""
+    stem = os.path.splitext(model_path)[0]
+    return f"{stem}_raster.npy", f"{stem}_raster.sha256"
+
+
+def _file_digest(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _unit_vectors(alt, az):
+    """Cartesian unit vectors for (alt, az) in radians: shape (..., 3)."""
+    cos_alt = np.cos(alt)
+    return np.stack([cos_alt * np.cos(az), cos_alt * np.sin(az), np.sin(alt)], axis=-1)
+
+
+class _KDTree:
+    """
+    Cartesian k-d tree over points on the unit sphere.
+
+    On the sphere the chord length is a monotonic function of the angular
+    separation, so the nearest point in plain euclidean distance is also the
+    nearest on the sky. The tree only ever compares squared chords, which
+    needs no trigonometry on the stored points.
+    """
+
+    def __init__(self, points, leaf_size=16):
+        self._points = points
+        self._leaf_size = leaf_size
+        self._root = self._build(np.arange(len(points)))
+
+    def _build(self, index):
+        points = self._points[index]
+        if len(index) <= self._leaf_size:
+            # leaves keep their points contiguous for one vectorized distance
+            return (index, points)
+        axis = int(np.argmax(points.max(axis=0) - points.min(axis=0)))
+        order = np.argsort(points[:, axis], kind="stable")
+        middle = len(order) // 2
+        split = float(points[order[middle], axis])
+        return (
+            axis,
+            split,
+            self._build(index[order[:middle]]),
+            self._build(index[order[middle:]]),
+        )
+
+    def query(self, point):
+        """Returns (index, squared chord) of the point nearest to `point`."""
+        best = [math.inf, -1]
+        self._query(self._root, point, best)
+        return best[1], best[0]
+
+    def _query(self, node, point, best):
+        if len(node) == 2:
+            index, points = node
+            d2 = ((points - point) ** 2).sum(axis=1)
+            i = int(np.argmin(d2))
+            # ties go to the lowest table row, like a linear scan would
+            if d2[i] < best[0] or (d2[i] == best[0] and index[i] < best[1]):
+                best[0], best[1] = float(d2[i]), int(index[i])
+            return
+        axis, split, left, right = node
+        offset = point[axis] - split
+        near, far = (left, right) if offset < 0 else (right, left)
+        self._query(near, point, best)
+        if offset * offset <= best[0]:
+            self._query(far, point, best)
+
+
+def _cache_dir():
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, "chimera_lna")
+
+
+def _read_table(model_path):
+    """
+    The (alt, az, tag) rows of a model CSV. The parsed table is cached as
+    .npy in the user cache directory under the digest of the CSV, so a
+    changed CSV never hits a stale cache, and later loads memory-map it
+    instead of parsing text.
+    """
+    stem = os.path.splitext(os.path.basename(model_path))[0]
+    cache_path = os.path.join(
+        _cache_dir(), f"{stem}-{_file_digest(model_path)[:16]}.npy"
+    )
+    try:
+        table = np.load(cache_path, mmap_mode="r")
+        if table.ndim == 2 and table.shape[1] == 3:
+            return table
+    except (OSError, ValueError):
+        pass
+    table = np.loadtxt(model_path, delimiter=",", ndmin=2)
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        # write aside and rename: concurrent processes never read half a file
+        partial = f"{cache_path}.{os.getpid()}.tmp"
+        with open(partial, "wb") as f:
+            np.save(f, table)
+        os.replace(partial, cache_path)
+    except OSError:
+        pass  # no writable cache: parse the text again next time
+    return table
+
+
+def _load_raster(model_path):
+    """
+    Memory-map the compiled raster of model_path (see compile_raster), or
+    None when there is none or it was compiled from a different CSV.
+    """
+    raster_path, digest_path = _raster_paths(model_path)
+    try:
+        with open(digest_path) as f:
+            digest = f.read().strip()
+        if digest != _file_digest(model_path):
+            return None
+        return np.load(raster_path, mmap_mode="r")
+    except (OSError, ValueError):
+        return None
+
+
+class _DomeModel:
+    """Everything derived from one version of a dome model CSV."""
+
+    def __init__(self, model_path):
+        table = _read_table(model_path)
+        self.alt = table[:, 0]  # radians
+        self.az = table[:, 1]  # radians
+        self.tags = table[:, 2].astype(int)
+        # unit vectors are computed once: queries only do trig on the query
+        self.points = _unit_vectors(self.alt, self.az)
+        self.tree = _KDTree(self.points)
+        self.raster = _load_raster(model_path)
+
+
+_models = {}
+_models_lock = threading.Lock()
+
+
+def load_dome_model(model_path=MODEL_PATH):
+    """
+    The process-wide model of model_path: loaded once and shared by every
+    DomeLookupTable, reloaded only when the CSV changes on disk.
+    """
+    model_path = os.path.abspath(model_path)
+    stat = os.stat(model_path)
+    version = (stat.st_mtime_ns, stat.st_size)
+    with _models_lock:
+        loaded = _models.get(model_path)
+        if loaded is None or loaded[0] != version:
+            loaded = _models[model_path] = (version, _DomeModel(model_path))
+        return loaded[1]
+
 
 class DomeLookupTable:
     """
     Maps telescope (alt, az) positions to the nearest dome tag using the
     empirical dome model table (data/dome_model.csv: alt[rad], az[rad], tag).
+
+    The model is only loaded on the first lookup (see load_dome_model), so
+    creating a table costs nothing.
     """
 
-    def __init__(self):
-        table = np.loadtxt(
-            os.path.join(
-                os.path.dirname(chimera_lna.__file__), "data", "dome_model.csv"
-            ),
-            delimiter=",",
-        )
-        self._alt = table[:, 0]  # radians
-        self._az = table[:, 1]  # radians
-        self._tags = table[:, 2].astype(int)
+    def __init__(self, model_path=MODEL_PATH):
+        self._model_path = model_path
+        self._model = None
+
+    def _get_model(self):
+        if self._model is None:
+            self._model = load_dome_model(self._model_path)
+        return self._model
+
+    def reload(self):
+        """Drop the model: the next lookup picks up a changed CSV."""
+        self._model = None
+
+    @property
+    def _alt(self):
+        return self._get_model().alt
+
+    @property
+    def _az(self):
+        return self._get_model().az
+
+    @property
+    def _tags(self):
+        return self._get_model().tags
+
+    @property
+    def _raster(self):
+        return self._get_model().raster
 
     def _angular_separation(self, alt, az):
         """
@@ -42,11 +226,146 @@ class DomeLookupTable:
         If ret_distance is `True`, also returns the angular distance (degrees)
         from the lookup table entry to the point.
         """
-        separation = self._angular_separation(np.radians(alt), np.radians(az))
-        argmin = int(np.argmin(separation))
+        model = self._model or self._get_model()
+        raster = model.raster
+        if raster is not None and not ret_distance and 0.0 <= alt <= 90.0:
+            # constant time: the cell holds a tag only when every point in it
+            # has that tag as the nearest one, 0 (exact search) otherwise
+            rows, cols = raster.shape
+            row = min(int(alt * rows / 90.0), rows - 1)
+            col = int((az % 360.0) * cols / 360.0) % cols
+            tag = int(raster[row, col])
+            if tag:
+                return tag
+        alt, az = math.radians(alt), math.radians(az)
+        cos_alt = math.cos(alt)
+        point = np.array(
+            (cos_alt * math.cos(az), cos_alt * math.sin(az), math.sin(alt))
+        )
+        index, chord2 = model.tree.query(point)
         if ret_distance:
-            return int(self._tags[argmin]), float(np.degrees(separation[argmin]))
-        return int(self._tags[argmin])
+            # chord -> angle; well conditioned down to zero separation
+            separation = 2.0 * math.asin(min(1.0, math.sqrt(chord2) / 2.0))
+            return int(model.tags[index]), math.degrees(separation)
+        return int(model.tags[index])
+
+    # rows of the (queries x table) dot-product matrix computed at once
+    _batch_chunk = 4096
+
+    def get_tags_altaz(self, alt, az, ret_distance=False):
+        """
+        Vectorized get_tag_altaz: nearest tags for arrays of positions (alt,
+        az in degrees, broadcast against each other). Returns an int array of
+        tags with the broadcast shape and, if ret_distance is `True`, also the
+        angular distances (degrees) as a float array.
+        """
+        alt, az = np.broadcast_arrays(
+            np.radians(np.asarray(alt, dtype=float)),
+            np.radians(np.asarray(az, dtype=float)),
+        )
+        model = self._get_model()
+        points = _unit_vectors(alt.ravel(), az.ravel())
+        index = np.empty(len(points), dtype=np.intp)
+        for start in range(0, len(points), self._batch_chunk):
+            chunk = points[start : start + self._batch_chunk]
+            # largest cosine == smallest separation; argmax keeps the first
+            # (lowest row) of ties, like the single-point lookup
+            index[start : start + len(chunk)] = np.argmax(
+                chunk @ model.points.T, axis=1
+            )
+        tags = model.tags[index].reshape(alt.shape)
+        if not ret_distance:
+            return tags
+        chord = np.linalg.norm(model.points[index] - points, axis=1)
+        separation = 2.0 * np.arcsin(np.minimum(1.0, chord / 2.0))
+        return tags, np.degrees(separation).reshape(alt.shape)
+
+
+class TagCache:
+    """
+    Bounded LRU memo of DomeLookupTable.get_tag_altaz keyed on (alt, az)
+    quantized to `quantum` degrees: a tracking telescope moves a tiny
+    fraction of a tag between control cycles, so most lookups repeat.
+
+    Each key is answered for its quantized position, so an entry never
+    depends on which caller filled it. Call invalidate() when the model
+    changes; hits and misses count what the memo saves.
+    """
+
+    def __init__(self, lookup, quantum=0.05, maxsize=4096):
+        self._lookup = lookup
+        self._quantum = quantum
+        self._maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_tag_altaz(self, alt: float, az: float) -> int:
+        key = (round(alt / self._quantum), round((az % 360.0) / self._quantum))
+        with self._lock:
+            tag = self._entries.get(key)
+            if tag is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return tag
+            self.misses += 1
+        tag = self._lookup.get_tag_altaz(key[0] * self._quantum, key[1] * self._quantum)
+        with self._lock:
+            self._entries[key] = tag
+            if len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+        return tag
+
+    def invalidate(self):
+        """Forget every entry (the model changed)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+            }
+
+
+def compile_raster(model_path=MODEL_PATH, resolution=0.25):
+    """
+    Compile the dense alt/az raster of a dome model CSV, next to the CSV.
+
+    Each resolution x resolution (degrees) cell over alt 0-90 and az 0-360
+    holds the nearest tag of its center, but only when the second nearest
+    tag is farther by more than the cell diameter: then, by the triangle
+    inequality, every point of the cell has the same nearest tag. Cells on a
+    tag border hold 0 and DomeLookupTable falls back to the exact search.
+    """
+    table = _read_table(model_path)
+    points = _unit_vectors(table[:, 0], table[:, 1])
+    tags = table[:, 2].astype(int)
+
+    rows, cols = round(90.0 / resolution), round(360.0 / resolution)
+    # a cell point is at most resolution/2 in alt plus resolution/2 along its
+    # altitude circle away from the center
+    radius = np.radians(resolution)
+    cell_az = np.radians((np.arange(cols) + 0.5) * resolution)
+    raster = np.zeros((rows, cols), dtype=np.int16)
+    for row in range(rows):
+        cell_alt = np.radians((row + 0.5) * resolution)
+        cos_sep = _unit_vectors(np.full(cols, cell_alt), cell_az) @ points.T
+        nearest = np.argmax(cos_sep, axis=1)
+        tag = tags[nearest]
+        first = np.arccos(np.clip(cos_sep[np.arange(cols), nearest], -1.0, 1.0))
+        others = np.where(tags == tag[:, None], -np.inf, cos_sep).max(axis=1)
+        second = np.arccos(np.clip(others, -1.0, 1.0))
+        raster[row] = np.where(second - first > 2.0 * radius + 1e-9, tag, 0)
+
+    raster_path, digest_path = _raster_paths(model_path)
+    np.save(raster_path, raster)
+    with open(digest_path, "w") as f:
+        f.write(_file_digest(model_path) + "\n")
+    return raster
 
 
 if __name__ == "__main__":
@@ -0,0 +1,241 @@
+# SPDX-FileCopyrightText: 2014-present William Schoenell <wschoenell@gmail.com>
+# SPDX-License-Identifier: GPL-2.0-or-later
+"""In-process counters and histograms, exportable in Prometheus text format."""
+
+import bisect
+import math
+import os
+import tempfile
+import threading
+
+# the process umask, read once (os.umask can only read it by setting it):
+# the mode an exported file would get from a plain open()
+_UMASK = os.umask(0o022)
+os.umask(_UMASK)
+
+# seconds: from a STATUS round trip on a healthy link (tens of ms) to a slit
+# command (TRAPTMO, 12 s) and a long queue wait behind a slew
+LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    15.0,
+    30.0,
+    60.0,
+)
+
+
+class Counter:
+    """A monotonically increasing value."""
+
+    kind = "counter"
+
+    def __init__(self, lock):
+        self._lock = lock
+        self.value = 0.0
+
+    def inc(self, amount=1.0):
+        with self._lock:
+            self.value += amount
+
+    def set(self, value):
+        """For values accumulated elsewhere and copied in at collection."""
+        with self._lock:
+            self.value = value
+
+    def snapshot(self):
+        return {"value": self.value}
+
+
+class Gauge(Counter):
+    """A value that goes up and down."""
+
+    kind = "gauge"
+
+
+class Histogram:
+    """Observation counts in cumulative buckets, plus count, sum and max."""
+
+    kind = "histogram"
+
+    def __init__(self, lock, buckets=LATENCY_BUCKETS):
+        self._lock = lock
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)  # last one: +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        with self._lock:
+            self._counts[bisect.bisect_left(self.buckets, value)] += 1
+            self.count += 1
+            self.sum += value
+            self.max = max(self.max, value)
+
+    def cumulative(self):
+        """[(upper bound, observations <= it)], ending with (inf, count)."""
+        total, result = 0, []
+        for bound, n in zip(self.buckets + (math.inf,), self._counts):
+            total += n
+            result.append((bound, total))
+        return result
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-quantile (None if empty)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        for bound, total in self.cumulative():
+            if total >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def snapshot(self):
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "max": self.max,
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+            "buckets": [[bound, n] for bound, n in self.cumulative()[:-1]],
+        }
+
+
+class MetricsRegistry:
+    """
+    Named, labelled metrics. Each (name, labels) pair is created on first
+    use and returned afterwards, so call sites need no registration step:
+
+        metrics = MetricsRegistry("dome_", {"retries_total": "Command retries"})
+        metrics.counter("retries_total", command=cmd).inc()
+
+    `help` maps metric names to their description in the export.
+
+    Collect hooks run before every snapshot or export, for values that are
+    cheaper to read on demand than to keep up to date (cache hit ratios,
+    time spent in an ongoing outage).
+    """
+
+    def __init__(self, prefix="", help=None):
+        self.prefix = prefix
+        self.help = dict(help or {})
+        self._lock = threading.Lock()
+        self._families = {}  # name -> (kind, help, {labels: metric})
+        self._hooks = []
+
+    def _get(self, cls, name, labels, **kwargs):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            family = self._families.get(name)
+            if family is None:
+                family = self._families[name] = (cls.kind, self.help.get(name), {})
+            elif family[0] != cls.kind:
+                raise ValueError(f"{name} is a {family[0]}, not a {cls.kind}")
+            metric = family[2].get(key)
+            if metric is None:
+                metric = family[2][key] = cls(self._lock, **kwargs)
+            return metric
+
+    def counter(self, name, **labels):
+        return self._get(Counter, name, labels)
+
+    def gauge(self, name, **labels):
+        return self._get(Gauge, name, labels)
+
+    def histogram(self, name, buckets=LATENCY_BUCKETS, **labels):
+        return self._get(Histogram, name, labels, buckets=buckets)
+
+    def family(self, name):
+        """{sorted label items: metric} for every metric called name."""
+        with self._lock:
+            family = self._families.get(name)
+            return dict(family[2]) if family else {}
+
+    def on_collect(self, hook):
+        self._hooks.append(hook)
+
+    def _collect(self):
+        for hook in self._hooks:
+            hook()
+        with self._lock:
+            return [
+                (name, kind, help, sorted(metrics.items()))
+                for name, (kind, help, metrics) in sorted(self._families.items())
+            ]
+
+    def snapshot(self):
+        """
+        Plain data (dicts, lists, numbers: safe to send over the chimera
+        bus): {name: [{"labels": {...}, <values>}, ...]}.
+        """
+        return {
+            self.prefix + name: [
+                {"labels": dict(labels), **metric.snapshot()}
+                for labels, metric in metrics
+            ]
+            for name, _, _, metrics in self._collect()
+        }
+
+    def to_prometheus(self):
+        """The Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        for name, kind, help, metrics in self._collect():
+            name = self.prefix + name
+            if help:
+                lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, metric in metrics:
+                if kind != "histogram":
+                    lines.append(f"{name}{_labels(labels)} {_number(metric.value)}")
+                    continue
+                for bound, n in metric.cumulative():
+                    le = labels + (("le", _number(bound)),)
+                    lines.append(f"{name}_bucket{_labels(le)} {n}")
+                lines.append(f"{name}_sum{_labels(labels)} {_number(metric.sum)}")
+                lines.append(f"{name}_count{_labels(labels)} {metric.count}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        """
+        Write to_prometheus() to path atomically (node_exporter's textfile
+        collector must never read a half-written file), readable by others
+        as the umask allows: the collector usually runs as another user.
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(self.to_prometheus())
+            # mkstemp creates it 0600, and os.replace keeps that mode
+            os.chmod(tmp, 0o666 & ~_UMASK)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+
+def _number(value):
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _labels(items):
+    if not items:
+        return ""
+    escaped = (
+        (key, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for key, value in items
+    )
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
@@ -0,0 +1,169 @@
+# SPDX-FileCopyrightText: 2014-present William Schoenell <wschoenell@gmail.com>
+# SPDX-License-Identifier: GPL-2.0-or-later
+"""Handles of dome slews running in the background."""
+
+import itertools
+import threading
+import time
+
+# states of a slew; the last four are final
+QUEUED, MOVING, DONE, FAILED, CANCELLED, SUPERSEDED = (
+    "queued",
+    "moving",
+    "done",
+    "failed",
+    "cancelled",
+    "superseded",
+)
+FINAL_STATES = frozenset({DONE, FAILED, CANCELLED, SUPERSEDED})
+
+
+class SlewHandle:
+    """
+    One dome slew, followed from another thread: its progress (see
+    progress()), callbacks on every change of it, an explicit cancel and a
+    wait for the result.
+
+    The slew itself runs elsewhere and reports through update() and
+    finish(); cancel() asks it to stop and calls on_cancel(handle), the
+    owner's hook to stop the dome, once. A slew given up for a newer
+    target is superseded: it ends without reaching its own, the newer slew
+    takes the dome over.
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(self, az, on_cancel=None):
+        self.id = next(self._ids)
+        self.az = az
+        self._on_cancel = on_cancel
+        self._lock = threading.Lock()
+        self._finished = threading.Event()
+        self._cancel = threading.Event()
+        self._superseded = False
+        self._wake = threading.Event()  # a cancel or a newer target
+        self._callbacks = []
+        self._started = time.monotonic()
+        self._progress = {
+            "id": self.id,
+            "az": az,
+            "state": QUEUED,
+            "target_tag": None,
+            "tag": None,
+            "eta": None,  # seconds left, as predicted
+            "attempts": 0,
+            "elapsed": 0.0,
+            "result": None,
+        }
+
+    def progress(self):
+        """
+        {"id", "az", "state", "target_tag", "tag", "eta" (seconds left),
+        "attempts", "elapsed" (seconds), "result"}: None while unknown;
+        result is True/False once the state is final.
+        """
+        with self._lock:
+            progress = dict(self._progress)
+        if progress["state"] not in FINAL_STATES:
+            progress["elapsed"] = time.monotonic() - self._started
+        return progress
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._progress["state"]
+
+    @property
+    def done(self):
+        return self._finished.is_set()
+
+    @property
+    def cancelled(self):
+        """Whether a cancel was asked (the slew may still be stopping)."""
+        return self._cancel.is_set()
+
+    @property
+    def superseded(self):
+        """Whether a newer target replaces this slew's."""
+        return self._superseded
+
+    def on_progress(self, callback):
+        """
+        Call callback(progress) on every change of the progress, from the
+        slewing thread, and right now with the current one.
+        """
+        with self._lock:
+            self._callbacks.append(callback)
+        self._notify(callback)
+
+    def update(self, **fields):
+        with self._lock:
+            if self._progress["state"] in FINAL_STATES:
+                return
+            self._progress.update(fields)
+            callbacks = list(self._callbacks)
+        for callback in callbacks:
+            self._notify(callback)
+
+    def finish(self, result):
+        """The slew ended: done, failed or (if asked to) cancelled."""
+        with self._lock:
+            if self._progress["state"] in FINAL_STATES:
+                return
+            if self._cancel.is_set():
+                state = CANCELLED
+            elif result:
+                state = DONE
+            else:
+                state = SUPERSEDED if self._superseded else FAILED
+            self._progress.update(
+                state=state,
+                result=bool(result),
+                eta=None,
+                elapsed=time.monotonic() - self._started,
+            )
+            callbacks = list(self._callbacks)
+        self._finished.set()
+        for callback in callbacks:
+            self._notify(callback)
+
+    def cancel(self, stop=True):
+        """
+        Ask the slew to stop. False when it had already ended, or a cancel
+        was already asked. stop=False: the caller stops the dome itself,
+        on_cancel is not called.
+        """
+        with self._lock:
+            if self._finished.is_set() or self._cancel.is_set():
+                return False
+            self._cancel.set()
+        self._wake.set()
+        if stop and self._on_cancel is not None:
+            self._on_cancel(self)
+        return True
+
+    def supersede(self):
+        """A newer target replaces this slew's: it should stop waiting."""
+        self._superseded = True
+        self._wake.set()
+
+    def sleep(self, timeout):
+        """
+        Sleep up to timeout seconds; True as soon as a cancel is asked or
+        the slew is superseded.
+        """
+        return self._wake.wait(timeout)
+
+    def wait(self, timeout=None):
+        """The result (True: on target), or None if still running."""
+        if not self._finished.wait(timeout):
+            return None
+        with self._lock:
+            return self._progress["result"]
+
+    def _notify(self, callback):
+        # a broken listener must not break the slew it listens to
+        try:
+            callback(self.progress())
+        except Exception:
+            pass
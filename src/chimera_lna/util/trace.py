@@ -0,0 +1,200 @@
+# SPDX-FileCopyrightText: 2014-present William Schoenell <wschoenell@gmail.com>
+# SPDX-License-Identifier: GPL-2.0-or-later
+"""Buffered, rotating trace log of the dome serial traffic."""
+
+import collections
+import gzip
+import json
+import os
+import shutil
+import threading
+import time
+
+
+class TraceLog:
+    """
+    A JSON-lines trace written by a background thread.
+
+    record() only appends to a bounded in-memory ring buffer, so the thread
+    that traces (the dome I/O worker, between a write and its read) never
+    waits on the disk. When the writer falls behind by more than `capacity`
+    records the oldest ones are dropped and counted, never the caller
+    blocked. One record per line:
+
+        {"t": 1767225600.123456, "th": "DomeLNA-serial", "ev": "write",
+         "cmd": "MEADE PROG STATUS"}
+
+    with an optional "d" (detail). The live file is rotated when it reaches
+    `max_bytes` or gets older than `max_seconds`, and when it is found
+    non-empty at start: the closed segment is renamed with the time it was
+    closed (`<path>.20260101-063000`), gzipped if `compress`, and only the
+    newest `backups` segments are kept.
+    """
+
+    def __init__(
+        self,
+        path,
+        capacity=65536,
+        max_bytes=16 * 1024 * 1024,
+        max_seconds=24 * 3600,
+        backups=14,
+        compress=True,
+        flush_interval=1.0,
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_seconds = max_seconds
+        self.backups = backups
+        self.compress = compress
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._buffer = collections.deque(maxlen=capacity)
+        self._wake = threading.Event()
+        self._stopping = False
+        self._file = None
+        self._opened_at = 0.0
+        self._thread = None
+
+    def start(self):
+        self._open(rotate_existing=True)
+        self._thread = threading.Thread(target=self._run, name="TraceLog", daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self):
+        """Write out everything recorded so far and stop the writer."""
+        if self._thread is None:
+            return
+        self._stopping = True
+        self._wake.set()
+        self._thread.join()
+        self._thread = None
+
+    def record(self, event, cmd="", detail=""):
+        """Queue one record. Never blocks, never raises."""
+        buffer = self._buffer
+        if len(buffer) == buffer.maxlen:
+            self.dropped += 1
+        buffer.append(
+            (time.time(), threading.current_thread().name, event, cmd, detail)
+        )
+
+    def flush(self):
+        """Wake the writer now instead of at the next flush_interval."""
+        self._wake.set()
+
+    def _entry(self, item):
+        """The JSON object written for one buffered record (writer thread)."""
+        t, thread, event, cmd, detail = item
+        entry = {"t": round(t, 6), "th": thread, "ev": event}
+        if cmd:
+            entry["cmd"] = cmd
+        if detail:
+            entry["d"] = detail
+        return entry
+
+    # writer thread
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            stopping = self._stopping
+            try:
+                self._write_pending()
+            except OSError:
+                # a full or vanished disk must not kill tracing for the
+                # rest of the night: reopen and try again next round
+                self._close_file()
+                try:
+                    self._open(rotate_existing=False)
+                except OSError:
+                    pass
+            if stopping:
+                self._close_file()
+                return
+
+    def _write_pending(self):
+        if self._file is None:
+            self._open(rotate_existing=False)
+        buffer = self._buffer
+        lines = []
+        while buffer:
+            entry = self._entry(buffer.popleft())
+            lines.append(json.dumps(entry, separators=(",", ":")))
+        if not lines:
+            return
+        self._file.write("\n".join(lines) + "\n")
+        self._file.flush()
+        if (
+            self._file.tell() >= self.max_bytes
+            or time.time() - self._opened_at >= self.max_seconds
+        ):
+            self._rotate()
+
+    def _open(self, rotate_existing):
+        if (
+            rotate_existing
+            and os.path.exists(self.path)
+            and os.path.getsize(self.path) > 0
+        ):
+            # the previous run's trace (last night) becomes a segment
+            self._rotate_file()
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._opened_at = time.time()
+        header = self._header()
+        if header is not None and self._file.tell() == 0:
+            self._file.write(json.dumps(header, separators=(",", ":")) + "\n")
+            self._file.flush()
+
+    def _header(self):
+        """The JSON object written first into every new file, or None."""
+        return None
+
+    def _close_file(self):
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            self._file = None
+
+    def _rotate(self):
+        self._close_file()
+        self._rotate_file()
+        self._open(rotate_existing=False)
+
+    def _rotate_file(self):
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        segment = f"{self.path}.{stamp}"
+        n = 1
+        while os.path.exists(segment) or os.path.exists(f"{segment}.gz"):
+            n += 1
+            segment = f"{self.path}.{stamp}-{n}"
+        os.replace(self.path, segment)
+        if self.compress:
+            with open(segment, "rb") as src, gzip.open(f"{segment}.gz", "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            os.unlink(segment)
+        self._prune()
+
+    def segments(self):
+        """Closed segments, oldest first."""
+        directory, name = os.path.split(os.path.abspath(self.path))
+        prefix = name + "."
+        return sorted(
+            (
+                os.path.join(directory, entry)
+                for entry in os.listdir(directory)
+                if entry.startswith(prefix)
+                and entry[len(prefix) : len(prefix) + 1].isdigit()
+            ),
+            key=os.path.getmtime,
+        )
+
+    def _prune(self):
+        for old in self.segments()[: -self.backups or None]:
+            try:
+                os.unlink(old)
+            except OSError:
+                pass
@@ -15,6 +15,18 @@ def free_tcp_port():
         return sock.getsockname()[1]
 
 
+@pytest.fixture(scope="session")
+def cache_home(tmp_path_factory):
+    return tmp_path_factory.mktemp("cache")
+
+
+@pytest.fixture(autouse=True)
+def _private_cache(monkeypatch, cache_home):
+    # the lookup tables cache their parsed CSVs under XDG_CACHE_HOME: never
+    # in the user's ~/.cache
+    monkeypatch.setenv("XDG_CACHE_HOME", str(cache_home))
+
+
 @pytest.fixture
 def manager():
     bus = Bus(f"tcp://127.0.0.1:{free_tcp_port()}")
@@ -0,0 +1,86 @@
+# SPDX-FileCopyrightText: 2014-present William Schoenell <wschoenell@gmail.com>
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+import shutil
+import sys
+import threading
+import time
+
+import pytest
+
+from chimera_lna.util.device_watch import DeviceWatch
+
+pytestmark = pytest.mark.skipif(
+    not sys.platform.startswith("linux"), reason="inotify is Linux-only"
+)
+
+
+def _appearances():
+    seen = threading.Event()
+    count = []
+
+    def on_appear():
+        count.append(time.monotonic())
+        seen.set()
+
+    return seen, count, on_appear
+
+
+class TestDeviceWatch:
+    def test_symlink_reappearing(self, tmp_path):
+        # /dev/serial/by-id/usb-... -> ../../ttyUSB0, re-created on every
+        # USB re-enumeration
+        node = tmp_path / "ttyUSB0"
+        node.touch()
+        link = tmp_path / "by-id" / "usb-Prolific-port0"
+        link.parent.mkdir()
+        link.symlink_to(node)
+        seen, count, on_appear = _appearances()
+
+        with DeviceWatch(link, on_appear=on_appear) as watch:
+            assert watch.exists()
+            link.unlink()
+            t0 = time.monotonic()
+            while watch.exists() and time.monotonic() - t0 < 2:
+                time.sleep(0.001)
+            assert not watch.exists()
+            assert not watch.wait(0.05)
+
+            link.symlink_to(node)
+            t0 = time.monotonic()
+            assert watch.wait(2)
+            assert seen.wait(2)
+            # woken by the event, not by a polling period
+            assert count[0] - t0 < 0.1
+        assert len(count) == 1
+
+    def test_parent_directory_reappearing(self, tmp_path):
+        # by-id itself goes away with the last USB serial adapter
+        by_id = tmp_path / "serial" / "by-id"
+        link = by_id / "usb-Prolific-port0"
+        seen, count, on_appear = _appearances()
+
+        with DeviceWatch(link, on_appear=on_appear) as watch:
+            assert not watch.exists()
+            by_id.mkdir(parents=True)
+            assert not watch.wait(0.05)
+            link.touch()
+            assert watch.wait(2)
+            assert seen.wait(2)
+
+            # gone and back again under a new directory of the same name
+            seen.clear()
+            shutil.rmtree(tmp_path / "serial")
+            t0 = time.monotonic()
+            while watch.exists() and time.monotonic() - t0 < 2:
+                time.sleep(0.001)
+            assert not watch.exists()
+            by_id.mkdir(parents=True)
+            link.touch()
+            assert seen.wait(2)
+        assert len(count) == 2
+
+    def test_stop_without_start(self, tmp_path):
+        watch = DeviceWatch(tmp_path / "ttyUSB0")
+        assert not watch.exists()
+        watch.stop()
@@ -0,0 +1,55 @@
+# SPDX-FileCopyrightText: 2014-present William Schoenell <wschoenell@gmail.com>
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+import numpy as np
+import pytest
+
+from chimera_lna.util.dome_offset import calc_dome_az
+
+# LNA geometry (see the notes in dome_offset.py), in cm
+PHI = np.radians(-22.53)
+GEOMETRY = dict(x0=0.0, y0=0.0, z0=30.0, dec_axis_length=49.2, dome_radius=147.0)
+
+
+def brute_force_dome_az(ha, dec):
+    """Walk the optical axis in tiny steps to where it leaves the dome."""
+    x0, y0, z0 = GEOMETRY["x0"], GEOMETRY["y0"], GEOMETRY["z0"]
+    length, radius = GEOMETRY["dec_axis_length"], GEOMETRY["dome_radius"]
+    x = x0 + length * np.cos(PHI) * np.cos(ha)
+    y = y0 - length * np.sin(PHI) * np.sin(ha)
+    z = z0 - length * np.cos(PHI) * np.sin(ha)
+    dang = (np.pi / 2.0 - dec) + PHI
+    v = np.array(
+        [
+            np.sin(ha) * np.sin(dang),
+            np.cos(dang),
+            np.cos(ha) * np.sin(dang) - np.cos(dang),
+        ]
+    )
+    path = np.linspace(0.0, 4.0 * radius, 400001)
+    points = np.array([x, y, z])[:, None] + path * v[:, None]
+    inside = (points**2).sum(axis=0) <= radius**2
+    px, py, _ = points[:, np.argmin(inside)]
+    return np.arctan2(py, px) % (2.0 * np.pi)
+
+
+class TestCalcDomeAz:
+    def test_matches_brute_force_crossing(self):
+        rng = np.random.default_rng(11)
+        ha = rng.uniform(-np.pi / 2, np.pi / 2, 20)
+        dec = rng.uniform(-np.pi / 2, np.radians(30), 20)
+        dome_az = calc_dome_az(ha, dec, PHI, **GEOMETRY)
+        assert dome_az.shape == (20,)
+        for i in range(20):
+            assert dome_az[i] == pytest.approx(
+                brute_force_dome_az(ha[i], dec[i]), abs=1e-4
+            )
+
+    def test_scalar_and_array_agree(self):
+        ha = np.linspace(-1.0, 1.0, 7)
+        dome_az = calc_dome_az(ha, -0.5, PHI, **GEOMETRY)
+        for i in range(len(ha)):
+            assert calc_dome_az(ha[i], -0.5, PHI, **GEOMETRY) == pytest.approx(
+                dome_az[i]
+            )
+        assert np.all((dome_az >= 0.0) & (dome_az < 2.0 * np.pi))
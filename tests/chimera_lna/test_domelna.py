@@ -6,16 +6,27 @@ Manager lifecycle, talking over a TCP socket to the dome controller simulator
 as if it were the real hardware.
 """
 
+import gzip
+import json
+import os
 import re
+import select
 import socket
+import sys
 import threading
 import time
+import types
 
+import numpy as np
 import pytest
 from chimera.instruments.faketelescope import FakeTelescope
 
 from chimera_lna.instruments.domelna import DomeLNA
 from chimera_lna.simulators.dome import DomeSimulator
+from chimera_lna.simulators.replay import ReplaySimulator
+from chimera_lna.util.capture import SessionCapture, load_session
+from chimera_lna.util.follow import altaz_ahead
+from chimera_lna.util.frames import StatusFrameAssembler
 
 # fast dome: full turn in less than a second
 SIMULATOR_SPEED = 500.0  # tags/s
@@ -93,6 +104,20 @@ class TestDomeSimulatorProtocol:
             assert raw_command(simulator, "MEADE DOMO MOVER = 800") == "NAK"
 
 
+class _CannedPort:
+    """Serves canned reads; empty once drained (a read timeout)."""
+
+    def __init__(self, *chunks):
+        self.chunks = list(chunks)
+
+    @property
+    def in_waiting(self):
+        return len(self.chunks[0]) if self.chunks else 0
+
+    def read(self, size):
+        return self.chunks.pop(0) if self.chunks else b""
+
+
 class TestDomeLNAUnits:
     def test_tag_az_round_trip(self):
         # tag 801 is at azimuth 270, tag 846 is at azimuth 0
@@ -105,6 +130,49 @@ class TestDomeLNAUnits:
         for tag in (801, 820, 846, 900, 950, 980):
             assert DomeLNA._az_to_tag(DomeLNA._tag_to_az(tag)) == tag
 
+    def test_finished_slews_are_pruned_behind_a_waiting_one(self):
+        dome = DomeLNA()
+        waiting = dome._new_slew(90.0)
+        for _ in range(3 * DomeLNA._slews_kept):
+            dome._new_slew(90.0).finish(True)
+        assert len(dome._slews) == DomeLNA._slews_kept
+        assert dome.slew_handle(waiting.id) is waiting
+
+    def test_port_timeout_moves_in_steps(self):
+        learned = [0.3 + 0.01 * i for i in range(61)]  # 0.3 s .. 0.9 s
+        steps = {DomeLNA._port_timeout(timeout) for timeout in learned}
+        assert len(steps) <= 6
+        for timeout in learned:
+            # never shorter than asked, at most one step longer
+            assert timeout <= DomeLNA._port_timeout(timeout) < 1.25 * timeout + 1e-6
+        step = DomeLNA._port_timeout(0.3)
+        assert DomeLNA._port_timeout(step) == step
+
+    def test_blank_frames_start_one_initialization(self):
+        class SlowConfig(DomeLNA):
+            def __getitem__(self, key):
+                # widen the window between the check and the thread start
+                if key == "slew_timeout":
+                    time.sleep(0.05)
+                return super().__getitem__(key)
+
+        dome = SlowConfig()
+        started = []
+        dome._init_dome = lambda: (started.append(1), time.sleep(0.2))
+        barrier = threading.Barrier(8)
+
+        def blank_frame():
+            barrier.wait()
+            dome._request_init()
+
+        threads = [threading.Thread(target=blank_frame) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        dome._init_thread.join()
+        assert started == [1]
+
     def test_tag_distance_wraps(self):
         assert DomeLNA._tag_distance(905, 905) == 0
         assert DomeLNA._tag_distance(905, 907) == 2
@@ -137,6 +205,57 @@ class TestDomeLNAUnits:
         # blank tag (dome not initialized) is a distinct, valid case
         assert DomeLNA._status_blank_re.match("            *0001010000101000")
 
+    def test_read_frame(self):
+        def read_frame(*chunks):
+            dome = types.SimpleNamespace(_serial=_CannedPort(*chunks))
+            return DomeLNA._read_frame(dome, timeout=5.0)
+
+        frame, complete = read_frame(b"      ", b"  900 *00100000", b"00000000\r")
+        assert complete and frame == b"        900 *0010000000000000"
+        # bytes after the terminator are not part of the frame
+        assert read_frame(b"ACK\rNAK\r") == (b"ACK", True)
+        # no terminator before the port timed out: partial frame
+        assert read_frame(b"AC") == (b"AC", False)
+        assert read_frame() == (b"", False)
+
+    def test_read_status_frame(self):
+        frame = b"        900 *0010000000000000"
+
+        def read_status(*chunks):
+            dome = types.SimpleNamespace(
+                _serial=_CannedPort(*chunks), _frames=StatusFrameAssembler()
+            )
+            return DomeLNA._read_status_frame(dome, timeout=5.0)
+
+        # salvaged from behind EMI garbage
+        assert read_status(b"\x9a\xff" + frame[:9], frame[9:] + b"\r") == (
+            frame,
+            True,
+            b"\x9a\xff" + frame,
+        )
+        # a late ACK to an earlier command is skipped, not taken for the reply
+        assert read_status(b"ACK\r", frame + b"\r")[:2] == (frame, True)
+        # a corrupted frame is passed over for a good one read with it or
+        # already waiting, and is the reply (_parse_status rejects it) only
+        # when nothing else is there
+        corrupted = b"        979 *0015010010001000"
+        assert read_status(corrupted + b"\r" + frame + b"\r")[:2] == (frame, True)
+        assert read_status(corrupted + b"\r", frame + b"\r")[:2] == (frame, True)
+        assert read_status(corrupted + b"\r") == (corrupted, True, corrupted)
+        # only the segments looked at are counted
+        dome = types.SimpleNamespace(
+            _serial=_CannedPort(frame + b"\r" + corrupted + b"\r"),
+            _frames=StatusFrameAssembler(),
+        )
+        assert DomeLNA._read_status_frame(dome, timeout=5.0)[:2] == (frame, True)
+        stats = dome._frames.stats()
+        assert (stats["clean"], stats["corrupted"]) == (1, 0)
+        assert read_status(b"ACK\r", frame[:5]) == (
+            frame[:5],
+            False,
+            b"ACK\r" + frame[:5],
+        )
+
 
 class TestDomeLNALifecycle:
     """Full lifecycle through the chimera Manager and the TCP simulator."""
@@ -244,6 +363,35 @@ class TestDomeLNALifecycle:
         dome.slew_to_az(0.0)
         assert dome.is_sync_with_tel()
 
+    def test_follow_lead_saves_moves(self, simulator):
+        # three hours of a star rising in the east, one control cycle per
+        # simulated minute: chasing the beam against leading it
+        path = np.transpose(altaz_ahead(20.0, 80.0, -22.5344, np.arange(0, 10800, 60)))
+        moves = {}
+        for lead in (0.0, 1800.0):
+            dome = _io_dome(simulator, follow_lead=lead)
+            pointing = list(path[0])
+            telescope = types.SimpleNamespace(get_position_alt_az=lambda: pointing)
+            dome._get_tracking_telescope = lambda: telescope
+            # a smooth dome model: one tag per degree of telescope azimuth
+            dome._tag_cache = types.SimpleNamespace(
+                get_tag_altaz=lambda alt, az: 801 + int(az) % 180
+            )
+            try:
+                for alt, az in path:
+                    pointing[:] = alt, az
+                    assert dome.slew_to_az(0.0)
+                    assert dome.is_sync_with_tel()
+                stats = dome.follow_stats()
+                assert stats["following_seconds"] > 0
+                moves[lead] = stats["moves"]
+            finally:
+                dome._stop_io()
+        assert moves[0.0] > 0
+        # the beam crosses the whole slit (2 x dome_precision) between moves
+        # instead of half of it
+        assert moves[1800.0] <= moves[0.0] * 0.7
+
     def test_shutdown_closes_connection(self, simulator, manager):
         manager.add_class(
             DomeLNA, "stop", config={"device": simulator.device, **FAST_TIMINGS}
@@ -253,6 +401,49 @@ class TestDomeLNALifecycle:
         # still answers new connections
         assert raw_command(simulator, "MEADE PROG STATUS")[8:11].isdigit()
 
+    def test_metrics(self, simulator, manager, tmp_path):
+        metrics_file = tmp_path / "dome.prom"
+        dome = manager.add_class(
+            DomeLNA,
+            "metrics",
+            config={
+                "device": simulator.device,
+                "metrics_file": str(metrics_file),
+                "metrics_interval": 0.05,
+                **FAST_TIMINGS,
+            },
+        )
+        dome.slew_to_az(180.0)
+        dome.get_az()
+
+        metrics = dome.get_metrics()
+        rtt = {
+            m["labels"]["command"]: m
+            for m in metrics["chimera_lna_dome_serial_rtt_seconds"]
+        }
+        assert rtt["MEADE DOMO MOVER"]["count"] >= 1
+        assert 0 < rtt["MEADE PROG STATUS"]["p50"] <= rtt["MEADE PROG STATUS"]["max"]
+        waits = metrics["chimera_lna_dome_queue_wait_seconds"]
+        assert {m["labels"]["io_class"] for m in waits} >= {"motion", "status"}
+        assert metrics["chimera_lna_dome_link_up"][0]["value"] == 1
+        ratios = {
+            m["labels"]["cache"]: m["value"]
+            for m in metrics["chimera_lna_dome_cache_hit_ratio"]
+        }
+        assert 0 < ratios["status"] <= 1
+
+        t0 = time.time()
+        while not metrics_file.exists() and time.time() - t0 < 5:
+            time.sleep(0.01)
+        text = metrics_file.read_text()
+        assert "# TYPE chimera_lna_dome_serial_rtt_seconds histogram" in text
+        assert re.search(
+            r'^chimera_lna_dome_serial_rtt_seconds_count\{command="MEADE PROG STATUS"\} '
+            r"[1-9]",
+            text,
+            re.M,
+        )
+
 
 class _FastReconnectDome(DomeLNA):
     """DomeLNA with sub-second reconnect backoff, for failure-path tests."""
@@ -269,6 +460,85 @@ def _proxy(manager, path):
     )
 
 
+def _io_dome(simulator, **config):
+    """
+    A bare DomeLNA with only its I/O worker running (no startup reset),
+    returned once the worker's first background poll is done. The poller
+    then stays quiet for idle_poll_interval (an hour, unless overridden).
+    """
+    dome = DomeLNA()
+    dome["device"] = simulator.device
+    for key, value in {**FAST_TIMINGS, "idle_poll_interval": 3600, **config}.items():
+        dome[key] = value
+    dome._start_io()
+    t0 = time.time()
+    while dome._init_state == "unknown" and time.time() - t0 < 5:
+        time.sleep(0.01)
+    return dome
+
+
+def _slow_link(simulator, delay):
+    """Make every simulator reply take `delay` seconds; returns the command log."""
+    commands = []
+    process_command = simulator.process_command
+
+    def slow(command):
+        commands.append(command)
+        time.sleep(delay)
+        return process_command(command)
+
+    simulator.process_command = slow
+    return commands
+
+
+class _PtyController:
+    """
+    The simulator's protocol behind a pseudo-terminal, reached through a
+    symlink: a local device node that can be unplugged (hangup) and plugged
+    back, like a USB serial adapter re-enumerating under /dev/serial/by-id.
+    """
+
+    def __init__(self, simulator, link):
+        self.simulator = simulator
+        self.link = link
+        self._fds = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def device(self):
+        return str(self.link)
+
+    def plug(self):
+        self._fds = os.openpty()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+        self.link.symlink_to(os.ttyname(self._fds[1]))
+
+    def unplug(self):
+        if self._fds is None:
+            return
+        self.link.unlink()
+        self._stop.set()
+        self._thread.join()
+        for fd in self._fds:
+            os.close(fd)
+        self._fds = None
+
+    def _serve(self):
+        master = self._fds[0]
+        buffer = b""
+        while not self._stop.is_set():
+            if not select.select([master], [], [], 0.01)[0]:
+                continue
+            buffer += os.read(master, 1024)
+            while b"\r" in buffer:
+                command, buffer = buffer.split(b"\r", 1)
+                reply = self.simulator.process_command(command.decode())
+                os.write(master, f"{reply}\r".encode())
+
+
 class TestDomeLNAConcurrency:
     """The serial port is owned by one I/O thread: status queries must keep
     answering during a slew, motion sequences must exclude each other, and a
@@ -320,6 +590,531 @@ class TestDomeLNAConcurrency:
             assert latencies and max(latencies) < 2.0
             assert simulator.current_tag == DomeLNA._az_to_tag(180.0)
 
+    def test_concurrent_status_requests_share_one_transaction(self, simulator):
+        commands = _slow_link(simulator, 0.2)
+        dome = _io_dome(simulator)
+        commands.clear()
+        try:
+            replies = []
+            callers = [
+                threading.Thread(
+                    target=lambda: replies.append(dome._command("MEADE PROG STATUS"))
+                )
+                for _ in range(8)
+            ]
+            for caller in callers:
+                caller.start()
+            for caller in callers:
+                caller.join()
+            assert len(replies) == 8
+            assert all(DomeLNA._status_re.match(reply) for reply in replies)
+            # at most one transaction on the wire plus one queued behind it
+            assert commands.count("MEADE PROG STATUS") <= 2
+            coalesced = dome.get_metrics()["chimera_lna_dome_coalesced_requests_total"]
+            assert coalesced[0]["value"] == 8 - commands.count("MEADE PROG STATUS")
+            # commands with side effects are never shared
+            dome._command("MEADE FLAT_WEAK LIGAR")
+            dome._command("MEADE FLAT_WEAK LIGAR")
+            assert commands.count("MEADE FLAT_WEAK LIGAR") == 2
+        finally:
+            dome._stop_io()
+
+    def test_safety_commands_jump_the_queue(self, simulator):
+        commands = _slow_link(simulator, 0.05)
+        dome = _io_dome(simulator)
+        commands.clear()
+        try:
+            backlog = [
+                threading.Thread(target=lambda: dome._command("MEADE FLAT_WEAK LIGAR"))
+                for _ in range(10)
+            ]
+            for thread in backlog:
+                thread.start()
+            while not commands:
+                time.sleep(0.001)
+            t0 = time.time()
+            assert "ACK" in dome._command("MEADE TRAPEIRA FECHAR")
+            # behind at most the transaction already on the wire, not the
+            # whole backlog of ten
+            assert time.time() - t0 < 5 * 0.05
+            assert commands.index("MEADE TRAPEIRA FECHAR") <= 2
+            for thread in backlog:
+                thread.join()
+            stats = dome.queue_wait_stats()
+            assert stats["safety"]["count"] == 1
+            assert stats["status"]["count"] == 10
+            assert stats["safety"]["max"] < stats["status"]["max"]
+        finally:
+            dome._stop_io()
+
+    def test_reset_runs_as_one_uninterrupted_sequence(self, simulator):
+        commands = _slow_link(simulator, 0.0)
+        # a second's slew back to the park tag; a retry_delay the old fixed
+        # settle sleep would have paid on top of it
+        simulator.tags_per_second = 100.0
+        dome = _io_dome(simulator, retry_delay=2.0)
+        commands.clear()
+        try:
+            reset = threading.Thread(target=lambda: dome._reset_dome(950))
+            t0 = time.time()
+            reset.start()
+            while not any(c.startswith("MEADE DOMO MOVER") for c in commands):
+                time.sleep(0.001)
+            # lamp traffic waits for the sequence, closing the slit does not
+            lamp = threading.Thread(
+                target=lambda: dome._command("MEADE FLAT_WEAK LIGAR")
+            )
+            lamp.start()
+            t1 = time.time()
+            assert "ACK" in dome._command("MEADE TRAPEIRA FECHAR")
+            assert time.time() - t1 < 0.5
+            reset.join()
+            lamp.join()
+            assert time.time() - t0 < 2.0
+            assert simulator.current_tag == 950
+
+            assert commands[:4] == [
+                "MEADE PROG PARAR",
+                "MEADE PROG RESET",
+                "MEADE PROG STATUS",
+                "MEADE DOMO MOVER = 950",
+            ]
+            assert "MEADE TRAPEIRA FECHAR" in commands
+            assert commands.index("MEADE FLAT_WEAK LIGAR") == len(commands) - 1
+            assert commands[-2] == "MEADE PROG STATUS"
+        finally:
+            dome._stop_io()
+
+    def test_failed_slew_recovers_through_the_nearest_run_up(self, simulator):
+        simulator.tags_per_second = 100.0
+        process_command = simulator.process_command
+
+        def slipping(command):
+            # the first move toward 830 stops 15 tags short
+            if command == "MEADE DOMO MOVER = 830" and not slipping.done:
+                slipping.done = True
+                command = "MEADE DOMO MOVER = 845"
+            return process_command(command)
+
+        slipping.done = False
+        simulator.process_command = slipping
+        commands = _slow_link(simulator, 0.0)
+        dome = _io_dome(simulator)
+        commands.clear()
+        try:
+            assert dome.slew_to_az(DomeLNA._tag_to_az(830))
+            assert simulator.current_tag == 830
+            moves = [c for c in commands if c.startswith("MEADE DOMO MOVER")]
+            # back up 9 tags for a 24-tag run-up, not 66 tags away to 911
+            assert moves == [
+                "MEADE DOMO MOVER = 830",
+                "MEADE DOMO MOVER = 854",
+                "MEADE DOMO MOVER = 830",
+            ]
+            recovery = dome.get_metrics()["chimera_lna_dome_recovery_seconds"][0]
+            assert recovery["count"] == 1
+            assert 0.0 < recovery["sum"] < 2.0
+        finally:
+            dome._stop_io()
+
+    def test_async_slew_reports_progress(self, simulator):
+        simulator.tags_per_second = 50.0
+        dome = _io_dome(simulator)
+        try:
+            t0 = time.time()
+            slew_id = dome.slew_to_az_async(DomeLNA._tag_to_az(900))
+            # the caller is back before the dome even started
+            assert time.time() - t0 < 0.1
+            seen = []
+            dome.slew_handle(slew_id).on_progress(seen.append)
+            # a second caller is not turned away meanwhile
+            assert dome.slew_progress(slew_id)["target_tag"] in (None, 900)
+            assert dome.slew_handle(slew_id).wait(5) is True
+            assert simulator.current_tag == 900
+
+            progress = dome.slew_progress(slew_id)
+            assert progress["state"] == "done"
+            assert progress["attempts"] == 1
+            assert progress["tag"] == 900
+            moving = [p for p in seen if p["state"] == "moving" and p["tag"]]
+            assert moving[0]["tag"] < moving[-1]["tag"]
+            assert moving[0]["eta"] > moving[-1]["eta"]
+            assert seen[-1]["state"] == "done"
+            assert dome.slew_progress(-1) is None
+        finally:
+            dome._stop_io()
+
+    def test_cancel_slew_stops_the_dome(self, simulator):
+        simulator.tags_per_second = 20.0
+        commands = _slow_link(simulator, 0.0)
+        dome = _io_dome(simulator)
+        try:
+            # queued behind another motion, cancelled before it starts
+            with dome._motion_lock:
+                queued = dome.slew_to_az_async(DomeLNA._tag_to_az(850))
+                time.sleep(0.3)
+                assert dome.slew_progress(queued)["state"] == "queued"
+                assert dome.cancel_slew(queued)
+                assert dome.slew_progress(queued)["state"] == "cancelled"
+            slew_id = dome.slew_to_az_async(DomeLNA._tag_to_az(950))
+            time.sleep(0.5)
+            assert dome.cancel_slew(slew_id)
+            assert dome.slew_handle(slew_id).wait(2) is False
+            assert dome.slew_handle(queued).wait(2) is False
+            assert dome.slew_progress(slew_id)["state"] == "cancelled"
+            assert dome.slew_progress(queued)["state"] == "cancelled"
+            assert dome.slew_progress(queued)["attempts"] == 0
+            # stopped on the way, and stays there
+            stopped = simulator.current_tag
+            assert 850 < stopped < 950
+            time.sleep(0.3)
+            assert simulator.current_tag == stopped
+            assert not dome.cancel_slew(slew_id)
+            assert commands.count("MEADE PROG PARAR") == 1
+
+            # an abort sends its own PARAR, and only that one
+            aborted = dome.slew_to_az_async(DomeLNA._tag_to_az(820))
+            time.sleep(0.3)
+            assert dome.abort_slew()
+            assert dome.slew_handle(aborted).wait(2) is False
+            assert dome.slew_progress(aborted)["state"] == "cancelled"
+            assert commands.count("MEADE PROG PARAR") == 2
+        finally:
+            dome._stop_io()
+
+    def test_newest_target_takes_over_a_running_slew(self, simulator):
+        simulator.tags_per_second = 20.0
+        commands = _slow_link(simulator, 0.0)
+        dome = _io_dome(simulator)
+        try:
+            first = dome.slew_to_az_async(DomeLNA._tag_to_az(950))
+            time.sleep(0.5)
+            # two more targets while the first is on its way: the last wins
+            second = dome.slew_to_az_async(DomeLNA._tag_to_az(820))
+            t0 = time.time()
+            assert dome.slew_to_az(DomeLNA._tag_to_az(840))
+            elapsed = time.time() - t0
+            assert simulator.current_tag == 840
+            assert dome.slew_progress(first)["state"] == "superseded"
+            assert dome.slew_progress(second)["state"] == "superseded"
+
+            # stopped around 860, not at 950: about 20 tags back, not 110
+            assert elapsed < 2.5
+            moves = [c for c in commands if c.startswith("MEADE DOMO MOVER")]
+            assert moves[0] == "MEADE DOMO MOVER = 950"
+            assert moves[-1] == "MEADE DOMO MOVER = 840"
+            assert moves.count("MEADE DOMO MOVER = 950") == 1
+            retarget = commands.index("MEADE DOMO MOVER = 840")
+            assert "MEADE PROG PARAR" in commands[:retarget]
+        finally:
+            dome._stop_io()
+
+    def test_same_target_joins_the_running_slew(self, simulator):
+        simulator.tags_per_second = 20.0
+        commands = _slow_link(simulator, 0.0)
+        dome = _io_dome(simulator)
+        try:
+            first = dome.slew_to_az_async(DomeLNA._tag_to_az(950))
+            time.sleep(0.5)
+            # a sync racing the control loop asks for the same place
+            assert dome.slew_to_az(DomeLNA._tag_to_az(950))
+            assert dome.slew_handle(first).wait(5)
+            assert dome.slew_progress(first)["state"] == "done"
+            assert simulator.current_tag == 950
+            assert "MEADE PROG PARAR" not in commands
+            moves = [c for c in commands if c.startswith("MEADE DOMO MOVER")]
+            assert moves == ["MEADE DOMO MOVER = 950"]
+        finally:
+            dome._stop_io()
+
+    def test_device_wake_during_a_sequence(self, simulator):
+        simulator.tags_per_second = 100.0
+        dome = _io_dome(simulator)
+        try:
+            results = []
+            reset = threading.Thread(
+                target=lambda: results.append(dome._reset_dome(950))
+            )
+            reset.start()
+            # the USB node reappears while the sequence waits for the move
+            while not simulator.is_moving:
+                time.sleep(0.001)
+            dome._device_appeared()
+            reset.join()
+            assert results == [True]
+            assert simulator.current_tag == 950
+        finally:
+            dome._stop_io()
+
+    def test_stop_ends_a_running_sequence(self, simulator):
+        commands = _slow_link(simulator, 0.0)
+        dome = _io_dome(simulator)
+        try:
+            results = []
+            sequence = threading.Thread(
+                target=lambda: results.append(
+                    dome._sequence(
+                        [("sleep", 1.0), ("command", "MEADE DOMO MOVER = 950")]
+                    )
+                )
+            )
+            sequence.start()
+            time.sleep(0.2)
+            assert dome.abort_slew()
+            sequence.join()
+            assert results == [False]
+            assert "MEADE PROG PARAR" in commands
+            assert "MEADE DOMO MOVER = 950" not in commands
+        finally:
+            dome._stop_io()
+
+    def test_slow_stop_on_retarget_is_not_a_failure(self, simulator):
+        simulator.tags_per_second = 20.0
+        process_command = simulator.process_command
+        stopping_until = [0.0]
+
+        def ramping_down(command):
+            # the inverter takes 0.6 s to stop: busy that long after PARAR
+            reply = process_command(command)
+            if command == "MEADE PROG PARAR":
+                stopping_until[0] = time.monotonic() + 0.6
+            elif (
+                command == "MEADE PROG STATUS" and time.monotonic() < stopping_until[0]
+            ):
+                reply = reply.replace("*0010", "*0001")
+            return reply
+
+        simulator.process_command = ramping_down
+        commands = _slow_link(simulator, 0.0)
+        dome = _io_dome(simulator, serial_timeout=0.3)
+        try:
+            dome.slew_to_az_async(DomeLNA._tag_to_az(950))
+            time.sleep(0.3)
+            assert dome.slew_to_az(DomeLNA._tag_to_az(840))
+            assert simulator.current_tag == 840
+            assert "MEADE PROG RESET" not in commands
+        finally:
+            dome._stop_io()
+
+    def test_abort_right_after_a_hand_over(self, simulator):
+        simulator.tags_per_second = 20.0
+        commands = _slow_link(simulator, 0.0)
+        dome = _io_dome(simulator)
+        try:
+            first = dome.slew_to_az_async(DomeLNA._tag_to_az(950))
+            time.sleep(0.3)
+            second = dome.slew_to_az_async(DomeLNA._tag_to_az(820))
+            assert dome.abort_slew()
+            assert dome.slew_handle(first).wait(2) is False
+            assert dome.slew_handle(second).wait(2) is False
+            # superseded if the second one took over before the abort
+            assert dome.slew_progress(first)["state"] in ("cancelled", "superseded")
+            assert dome.slew_progress(second)["state"] == "cancelled"
+            # the operator's stop holds: nothing moves the dome on to 820
+            stopped = simulator.current_tag
+            time.sleep(0.3)
+            assert simulator.current_tag == stopped != 820
+            last_stop = len(commands) - 1 - commands[::-1].index("MEADE PROG PARAR")
+            assert not any(
+                c.startswith("MEADE DOMO MOVER") for c in commands[last_stop:]
+            )
+        finally:
+            dome._stop_io()
+
+    def test_abandoned_commands_never_reach_the_port(self, simulator):
+        commands = _slow_link(simulator, 0.3)
+        dome = _io_dome(simulator, serial_timeout=1.0)
+        commands.clear()
+        try:
+            # ~2.4 s of work ahead of anything queued now
+            backlog = [dome._submit("MEADE FLAT_WEAK LIGAR", 30)[0] for _ in range(8)]
+            # expires in the queue; its caller does not even wait
+            expired, _ = dome._submit("MEADE PROG STATUS", 0.05)
+            # the caller gives up after budget + 2 * serial_timeout
+            assert dome._command("MEADE FLAT_WEAK DESLIGAR", deadline=0.05) == ""
+            for future in backlog:
+                assert "ACK" in future.result(timeout=5)
+            assert expired.result(timeout=1) == ""
+            assert "MEADE PROG STATUS" not in commands
+            assert "MEADE FLAT_WEAK DESLIGAR" not in commands
+            assert simulator.lamp_on
+            assert dome.dropped_command_stats() == {"cancelled": 1, "expired": 1}
+        finally:
+            dome._stop_io()
+
+    def test_reply_timeouts_are_learned_per_command(self, simulator):
+        process_command = simulator.process_command
+
+        def slow_slit(command):
+            if command.startswith("MEADE TRAPEIRA"):
+                time.sleep(0.8)  # the board drives the slit before answering
+            return process_command(command)
+
+        simulator.process_command = slow_slit
+        dome = _io_dome(
+            simulator, serial_timeout=2.0, slit_timeout=1.5, heal_interval=0.1
+        )
+        try:
+            # before enough replies were seen, the ceiling
+            assert dome._reply_timeout("MEADE PROG STATUS") == 2.0
+            for _ in range(DomeLNA._rtt_min_samples):
+                dome._command("MEADE PROG STATUS")
+            # tens of milliseconds per reply: held up only by the floor
+            assert dome._reply_timeout("MEADE PROG STATUS") == 0.3
+            assert dome.reply_timeout_stats()["MEADE PROG STATUS"]["samples"] >= 8
+
+            # a silent dome fails a STATUS in well under a second, but only
+            # a miss at the ceiling declares the link down
+            simulator.muted = True
+            t0 = time.time()
+            assert dome._command("MEADE PROG STATUS", deadline=0.2) == ""
+            assert time.time() - t0 < 0.6
+            assert dome._io_healthy
+            t0 = time.time()
+            assert dome._command("MEADE PROG STATUS", deadline=0.2) == ""
+            assert 2.0 <= time.time() - t0 < 3.0
+            assert not dome._io_healthy
+            simulator.muted = False
+            t0 = time.time()
+            while not dome._io_healthy and time.time() - t0 < 5:
+                time.sleep(0.01)
+
+            # while the slit, slower than a STATUS ever is, keeps its own
+            assert "ACK" in dome._command("MEADE TRAPEIRA ABRIR")
+            assert simulator.slit_open
+            assert dome._reply_timeout("MEADE TRAPEIRA FECHAR") == 1.5
+        finally:
+            dome._stop_io()
+
+    def test_one_slow_status_does_not_take_the_link_down(self, simulator):
+        process_command = simulator.process_command
+        slow = []
+
+        def late_once(command):
+            if command == "MEADE PROG STATUS" and slow:
+                slow.pop()
+                time.sleep(0.5)  # well within the board's normal silences
+            return process_command(command)
+
+        simulator.process_command = late_once
+        dome = _io_dome(simulator, serial_timeout=2.0, heal_interval=60)
+        reconnects = []
+        dome._reconnect = lambda deadline=None: reconnects.append(deadline)
+        try:
+            for _ in range(DomeLNA._rtt_min_samples + 2):
+                dome._command("MEADE PROG STATUS")
+            assert dome._reply_timeout("MEADE PROG STATUS") == 0.3
+            # a background poll's single try misses the learned timeout
+            slow.append(True)
+            assert dome._command("MEADE PROG STATUS", deadline=0.05) == ""
+            time.sleep(0.4)  # the late reply lands, and is flushed
+            assert dome._io_healthy
+            assert "ACK" in dome._command("MEADE TRAPEIRA FECHAR")
+            assert not simulator.slit_open
+            assert dome._io_healthy
+            assert not reconnects
+            downs = dome.get_metrics().get("chimera_lna_dome_link_down_total", [])
+            assert sum(sample["value"] for sample in downs) == 0
+        finally:
+            dome._stop_io()
+
+    def test_slews_poll_around_the_learned_arrival(self):
+        # a dome with a start-up delay and a JOG zone, 20 polls per second
+        with DomeSimulator(
+            initial_tag=850,
+            tags_per_second=100.0,
+            jog_tags_per_second=20.0,
+            start_delay=0.2,
+        ) as simulator:
+            commands = _slow_link(simulator, 0.0)
+            dome = _io_dome(simulator, poll_interval=0.05, idle_poll_interval=0.5)
+            try:
+                # learning: the first slews poll all the way
+                for tag in (856, 880, 870, 960, 900, 920):
+                    assert dome.slew_to_az(DomeLNA._tag_to_az(tag))
+                model = dome.kinematics_model()
+                assert model["speed"] == pytest.approx(100.0, rel=0.3)
+                assert model["jog_speed"] == pytest.approx(20.0, rel=0.3)
+                assert model["startup"] == pytest.approx(0.2, abs=0.1)
+                # 0.2 + 78 / 100 + 12 / 20 s
+                assert dome.estimate_slew_time(830) == pytest.approx(1.58, rel=0.15)
+
+                commands.clear()
+                t0 = time.time()
+                slew = dome.slew_handle(dome.slew_to_az_async(DomeLNA._tag_to_az(830)))
+                # readers see the move while the slew waits for its ETA:
+                # right away, then at the idle pace
+                time.sleep(0.1)
+                assert dome.is_slewing()
+                time.sleep(0.7)
+                assert 840 < dome._read_status()[0] < 910
+                assert slew.wait(5) is True
+                elapsed = time.time() - t0
+                assert simulator.current_tag == 830
+                # arrival noticed within a few polls of it
+                assert elapsed < 1.58 + 0.3
+                # one poll every poll_interval would be more than 30
+                assert commands.count("MEADE PROG STATUS") <= 12
+            finally:
+                dome._stop_io()
+
+    def test_background_poller_keeps_the_status_fresh(self, simulator):
+        commands = _slow_link(simulator, 0.0)
+        dome = _io_dome(simulator, idle_poll_interval=0.1)
+        try:
+            time.sleep(0.5)
+            stats = dome.status_poll_stats()
+            assert stats["polls"] >= 3
+            assert stats["period"] == 0.1  # idle
+            assert stats["cache_age"] < 0.1 + 0.05
+            # status queries answer from memory: no transaction of their own
+            commands.clear()
+            for _ in range(100):
+                dome._read_status()
+            assert len(commands) < 10
+
+            # a move switches the poller to poll_interval until the dome stops
+            assert "ACK" in dome._command("MEADE DOMO MOVER = 950")
+            t0 = time.time()
+            while not dome._read_status()[1] and time.time() - t0 < 1:
+                time.sleep(0.005)
+            assert dome._read_status()[1]  # busy, seen without asking
+            assert dome.status_poll_stats()["period"] == FAST_TIMINGS["poll_interval"]
+            while dome._read_status()[1] and time.time() - t0 < 5:
+                time.sleep(0.005)
+            assert dome._read_status() == (950, False)
+            assert dome.status_poll_stats()["period"] == 0.1
+        finally:
+            dome._stop_io()
+
+    def test_status_reads_never_wait_for_initialization(self):
+        with DomeSimulator(initial_tag=850, tags_per_second=20) as simulator:
+            dome = _io_dome(simulator, slew_timeout=10, motion_wait=10)
+            try:
+                assert dome.is_initialized()
+                # the controller loses its position; hold the motion lock so
+                # the initialization cannot finish behind the test's back
+                with dome._motion_lock:
+                    simulator.initialized = False
+                    assert dome._get_status() == "blank"
+                    assert dome._init_thread.is_alive()
+                    # reads answer at once with the last known state,
+                    # flagged uninitialized
+                    t0 = time.time()
+                    for _ in range(10):
+                        assert dome.get_az() == dome._tag_to_az(850)
+                        assert not dome.is_slewing()
+                    assert time.time() - t0 < 0.5
+                    assert not dome.is_initialized()
+
+                dome._init_thread.join(timeout=10)
+                assert simulator.current_tag == dome._park_tag
+                dome._get_status()
+                assert dome.is_initialized()
+                assert dome.get_az() == dome._tag_to_az(dome._park_tag)
+            finally:
+                dome._stop_io()
+
     def test_concurrent_motion_declines_without_raising(self, manager):
         with DomeSimulator(initial_tag=900, tags_per_second=20) as simulator:
             dome = manager.add_class(
@@ -376,6 +1171,16 @@ class TestDomeLNAConcurrency:
         assert dome.get_metadata(None)  # header gathering still works
         assert time.time() - t0 < 30
 
+        metrics = dome.get_metrics()
+        assert metrics["chimera_lna_dome_link_up"][0]["value"] == 0
+        assert metrics["chimera_lna_dome_link_down_total"][0]["value"] >= 1
+        assert metrics["chimera_lna_dome_unhealthy_seconds_total"][0]["value"] > 0
+        reconnects = {
+            m["labels"]["result"]: m["value"]
+            for m in metrics["chimera_lna_dome_reconnects_total"]
+        }
+        assert reconnects["failed"] >= 1
+
     def test_recovers_on_its_own_when_the_dome_comes_back(self, manager):
         # a power-cycled controller (2026-07-25) must not need a chimera
         # restart: the worker keeps probing until the dome answers again
@@ -403,6 +1208,36 @@ class TestDomeLNAConcurrency:
         finally:
             recovered.stop()
 
+    @pytest.mark.skipif(
+        not sys.platform.startswith("linux"), reason="inotify is Linux-only"
+    )
+    def test_reopens_the_moment_the_device_node_reappears(self, tmp_path):
+        link = tmp_path / "by-id" / "usb-Prolific_Technology_Inc.-port0"
+        link.parent.mkdir()
+        controller = _PtyController(DomeSimulator(), link)
+        controller.plug()
+        # backoff and heal timers far beyond the test: only the watch can
+        # bring the link back in time
+        dome = _io_dome(controller, serial_timeout=0.5, heal_interval=60)
+        dome._reconnect_delays = (60.0,)
+        try:
+            assert dome._device_watch is not None
+            assert "ACK" in dome._command("MEADE FLAT_WEAK LIGAR")
+
+            controller.unplug()
+            assert dome._command("MEADE PROG STATUS", deadline=0.2) == ""
+            assert not dome._io_healthy
+
+            controller.plug()
+            t0 = time.time()
+            while not dome._io_healthy and time.time() - t0 < 5:
+                time.sleep(0.001)
+            assert time.time() - t0 < 0.5
+            assert dome._parse_status(dome._command("MEADE PROG STATUS"))
+        finally:
+            dome._stop_io()
+            controller.unplug()
+
     def test_close_slit_raises_when_the_dome_never_answers(self, simulator, manager):
         # the one exception left: an open slit that silently fails to close
         # is a hazard, so the supervisor must hear about it
@@ -440,3 +1275,98 @@ class TestDomeLNAConcurrency:
                 break
             time.sleep(0.2)
         assert simulator.current_tag == DomeLNA._az_to_tag(180.0)
+
+
+class TestSessionReplay:
+    def test_rotated_capture_replays_whole(self, tmp_path):
+        path = tmp_path / "night.jsonl"
+        # last night's capture: rotated away at start, not part of tonight
+        last_night = SessionCapture(str(path)).start()
+        last_night.transaction(time.monotonic(), "MEADE PROG PARAR", b"ACK", True, 0.01)
+        last_night.close()
+
+        capture = SessionCapture(
+            str(path), max_bytes=300, backups=100, flush_interval=0.01
+        ).start()
+        for i in range(20):
+            capture.transaction(
+                time.monotonic(), f"MEADE DOMO MOVER = {900 + i}", b"ACK", True, 0.01
+            )
+            capture.flush()
+            time.sleep(0.02)
+        capture.close()
+
+        segments = capture.segments()
+        assert len(segments) > 2
+        headers = []
+        for segment in [*segments, str(path)]:
+            opener = gzip.open if segment.endswith(".gz") else open
+            with opener(segment, "rt") as f:
+                headers.append(json.loads(f.readline()))
+        assert all(h["session"] == "dome" for h in headers)
+        # the first segment is last night's; every one of tonight's has a
+        # header of the same session, each later on the capture's clock
+        started = {h["started"] for h in headers[1:]}
+        assert len(started) == 1 and headers[0]["started"] not in started
+        assert [h["t"] for h in headers[1:]] == sorted(h["t"] for h in headers[1:])
+
+        moves = [f"MEADE DOMO MOVER = {900 + i}" for i in range(20)]
+        for start in (str(path), segments[1], segments[-1]):
+            assert [t["out"] for t in load_session(start)] == moves
+        assert [t["out"] for t in load_session(segments[0])] == ["MEADE PROG PARAR"]
+        with ReplaySimulator(segments[2]) as replay:
+            assert len(replay.transactions) == 20
+
+    def test_captured_night_replays_byte_for_byte(self, simulator, tmp_path):
+        capture = str(tmp_path / "night.jsonl")
+        respond = simulator.respond
+        night = iter(
+            [
+                None,  # the worker's first poll: answered live
+                "slow",
+                b"  9\x9a0 *00\xff0000\r",  # EMI: a garbled frame
+                "stall",
+            ]
+        )
+
+        def eventful(command):
+            event = next(night, None)
+            if event == "slow":
+                time.sleep(0.3)
+            elif event == "stall":
+                return None
+            elif event is not None:
+                return event
+            return respond(command)
+
+        simulator.respond = eventful
+        timings = {"serial_timeout": 0.5, "heal_interval": 3600}
+        dome = _io_dome(simulator, capture_file=capture, **timings)
+        try:
+            recorded = [dome._command("MEADE PROG STATUS") for _ in range(2)]
+            assert dome._command("MEADE PROG STATUS", deadline=0.2) == ""
+        finally:
+            dome._stop_io()
+
+        session = load_session(capture)
+        assert [t["out"] for t in session] == ["MEADE PROG STATUS"] * 4
+        assert session[1]["dur"] >= 0.3
+        assert session[2]["in"].encode("latin-1") == b"  9\x9a0 *00\xff0000"
+        assert session[3]["complete"] is False
+        assert session[3]["in"] == ""
+
+        with ReplaySimulator(capture) as replay:
+            dome = _io_dome(replay, **timings)
+            try:
+                t0 = time.time()
+                assert [dome._command("MEADE PROG STATUS") for _ in range(2)] == (
+                    recorded
+                )
+                # the slow reply kept its timing
+                assert time.time() - t0 >= 0.3
+                assert dome._command("MEADE PROG STATUS", deadline=0.2) == ""
+            finally:
+                dome._stop_io()
+            assert replay.finished
+            assert replay.replayed == 4
+            assert replay.unmatched == 0
@@ -0,0 +1,54 @@
+# SPDX-FileCopyrightText: 2014-present William Schoenell <wschoenell@gmail.com>
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+import numpy as np
+import pytest
+
+from chimera_lna.util.follow import FollowStats, altaz_ahead, lead_path
+
+SIDEREAL_DAY = 86164.0905
+
+
+class TestAltazAhead:
+    def test_equator_zenith_sets_in_the_west(self):
+        alt, az = altaz_ahead(90.0, 0.0, 0.0, SIDEREAL_DAY / 4)
+        assert alt == pytest.approx(0.0, abs=1e-9)
+        assert az == pytest.approx(270.0)
+
+    def test_full_sidereal_day_comes_back(self):
+        alt, az = altaz_ahead(35.0, 123.0, -22.5344, [0.0, SIDEREAL_DAY])
+        assert alt == pytest.approx([35.0, 35.0])
+        assert az == pytest.approx([123.0, 123.0])
+
+    def test_rises_in_the_east_and_culminates_on_the_meridian(self):
+        # OPD: a star on the meridian, north of the zenith, moves west
+        alt, az = altaz_ahead(60.0, 0.0, -22.5344, [0.0, 600.0])
+        assert alt[1] < alt[0]
+        assert 270.0 < az[1] < 360.0
+        alt, _ = altaz_ahead(30.0, 90.0, -22.5344, 600.0)
+        assert alt > 30.0
+
+    def test_lead_path(self):
+        path = lead_path(45.0, 90.0, -22.5344, 300.0, steps=3)
+        assert len(path) == 3
+        expected = np.transpose(
+            altaz_ahead(45.0, 90.0, -22.5344, [100.0, 200.0, 300.0])
+        )
+        assert np.allclose(path, expected)
+
+
+class TestFollowStats:
+    def test_time_on_target_and_moves_per_hour(self):
+        stats = FollowStats(max_gap=2000.0)
+        assert stats.stats()["moves_per_hour"] == 0.0
+        stats.sample(True, now=0.0)
+        stats.sample(False, now=1800.0)  # on target for half an hour
+        stats.moved()
+        stats.sample(True, now=1900.0)
+        stats.sample(True, now=3600.0)
+        # not following for an hour: counts toward nothing
+        stats.sample(False, now=7200.0)
+        result = stats.stats()
+        assert result["following_seconds"] == pytest.approx(3600.0)
+        assert result["moves_per_hour"] == pytest.approx(1.0)
+        assert result["on_target_ratio"] == pytest.approx(3500.0 / 3600.0)
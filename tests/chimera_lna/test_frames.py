@@ -0,0 +1,55 @@
+# SPDX-FileCopyrightText: 2014-present William Schoenell <wschoenell@gmail.com>
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+from chimera_lna.util.frames import StatusFrameAssembler
+
+FRAME = b"        900 *0010000000000000"
+
+
+class TestStatusFrameAssembler:
+    def test_clean_frames_across_chunks(self):
+        frames = StatusFrameAssembler()
+        assert frames.feed(FRAME[:10]) == []
+        assert frames.pending == FRAME[:10]
+        assert frames.feed(FRAME[10:] + b"\r" + FRAME[:3]) == [(FRAME, FRAME)]
+        assert frames.pending == FRAME[:3]
+        frames.reset()
+        assert frames.feed(FRAME + b"\r") == [(FRAME, FRAME)]
+        assert frames.stats()["clean"] == 2
+
+    def test_salvages_frames_behind_garbage(self):
+        # as captured on the wire while the dome was slewing
+        frames = StatusFrameAssembler()
+        for noisy in (
+            b"\x9a\xff" + FRAME,
+            b"ACK" + FRAME,  # late reply glued to the frame
+            b" " + FRAME,  # an extra space
+        ):
+            assert frames.feed(noisy + b"\r") == [(FRAME, noisy)]
+        blank = b"            *0001010000101000"
+        assert frames.feed(b"\x00" + blank + b"\r")[0][0] == blank
+        assert frames.stats() == {
+            "clean": 0,
+            "salvaged": 4,
+            "corrupted": 0,
+            "stray": 0,
+            "discarded_bytes": 7,
+        }
+
+    def test_discards_corrupted_frames_only(self):
+        frames = StatusFrameAssembler()
+        stream = b"NAK\r" + b"\r".join(
+            (
+                b"    \xff   805 *0011010000101000",
+                b"        979 *0015010010001000",
+                b"        979 *00110100100010000",  # an inserted bit
+                b"        979 *0011010010001000\x9a",
+                b"       $885 j0001010000101000",
+                FRAME,
+            )
+        )
+        results = frames.feed(stream + b"\r")
+        assert [frame for frame, _ in results] == [None] * 6 + [FRAME]
+        stats = frames.stats()
+        assert (stats["clean"], stats["corrupted"], stats["stray"]) == (1, 5, 1)
+        assert stats["discarded_bytes"] == len(stream) - len(FRAME) - 6
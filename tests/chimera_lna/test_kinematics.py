@@ -0,0 +1,43 @@
+# SPDX-FileCopyrightText: 2014-present William Schoenell <wschoenell@gmail.com>
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+import pytest
+
+from chimera_lna.util.kinematics import JOG_ZONE, DomeKinematics
+
+
+def _slew_time(distance, startup=3.0, speed=4.0, jog_speed=1.5):
+    fast = max(distance - JOG_ZONE, 0)
+    return startup + fast / speed + min(distance, JOG_ZONE) / jog_speed
+
+
+class TestDomeKinematics:
+    def test_prior_before_any_slew(self):
+        kinematics = DomeKinematics(speed=5.0, jog_speed=2.0, startup=1.0)
+        assert not kinematics.trained
+        assert kinematics.slew_time(0) == 0.0
+        assert kinematics.slew_time(5) == pytest.approx(1.0 + 5 / 2.0)
+        assert kinematics.slew_time(90) == pytest.approx(1.0 + 78 / 5.0 + 12 / 2.0)
+
+    def test_learns_speed_jog_and_startup(self):
+        kinematics = DomeKinematics()
+        for distance in (3, 8, 20, 45, 90, 60, 11, 30):
+            kinematics.observe(distance, _slew_time(distance))
+        assert kinematics.trained
+        assert kinematics.covers(90)
+        assert not kinematics.covers(91)
+        model = kinematics.model()
+        assert model["startup"] == pytest.approx(3.0, abs=0.05)
+        assert model["speed"] == pytest.approx(4.0, rel=0.02)
+        assert model["jog_speed"] == pytest.approx(1.5, rel=0.02)
+        assert model["samples"] == 8
+        assert kinematics.slew_time(70) == pytest.approx(_slew_time(70), rel=0.01)
+
+    def test_error_tracks_trained_predictions_only(self):
+        kinematics = DomeKinematics(min_samples=2)
+        # the prior is far off: its errors are not the model's
+        kinematics.observe(40, _slew_time(40))
+        kinematics.observe(80, _slew_time(80))
+        assert kinematics.error == 0.0
+        kinematics.observe(60, _slew_time(60) + 0.5)
+        assert 0.0 < kinematics.error < 1.0
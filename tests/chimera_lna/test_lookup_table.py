@@ -2,8 +2,15 @@
 # SPDX-License-Identifier: GPL-2.0-or-later
 
 import numpy as np
+import pytest
 
-from chimera_lna.util.lookup_table import DomeLookupTable
+from chimera_lna.util.lookup_table import (
+    DomeLookupTable,
+    TagCache,
+    _load_raster,
+    compile_raster,
+    load_dome_model,
+)
 
 
 class TestDomeLookupTable:
@@ -28,3 +35,95 @@ class TestDomeLookupTable:
         lookup = DomeLookupTable()
         tag, distance = lookup.get_tag_altaz(45, 180, ret_distance=True)
         assert 0.0 <= distance <= 180.0
+
+    def test_matches_linear_scan(self):
+        # the spatial index must give the same answer as a scan of the
+        # whole table, ties included
+        lookup = DomeLookupTable()
+        rng = np.random.default_rng(42)
+        points = zip(rng.uniform(0, 90, 2000), rng.uniform(0, 360, 2000))
+        for alt, az in points:
+            separation = lookup._angular_separation(np.radians(alt), np.radians(az))
+            argmin = int(np.argmin(separation))
+            tag, distance = lookup.get_tag_altaz(alt, az, ret_distance=True)
+            assert tag == lookup._tags[argmin]
+            assert distance == pytest.approx(np.degrees(separation[argmin]), abs=1e-6)
+
+    def test_batch_matches_single_lookups(self):
+        lookup = DomeLookupTable()
+        rng = np.random.default_rng(7)
+        alt = rng.uniform(0, 90, (50, 40))
+        az = rng.uniform(0, 360, (50, 40))
+        tags, distances = lookup.get_tags_altaz(alt, az, ret_distance=True)
+        assert tags.shape == distances.shape == (50, 40)
+        for (i, j), tag in np.ndenumerate(tags):
+            expected = lookup.get_tag_altaz(alt[i, j], az[i, j], ret_distance=True)
+            assert (tag, distances[i, j]) == pytest.approx(expected, abs=1e-6)
+        # scalars broadcast like numpy does
+        assert lookup.get_tags_altaz(45.0, [10.0, 20.0]).shape == (2,)
+
+    def test_raster_agrees_with_exact_search(self):
+        lookup = DomeLookupTable()
+        assert lookup._raster is not None  # shipped and up to date with the CSV
+        rng = np.random.default_rng(3)
+        alt = rng.uniform(0, 90, 5000)
+        az = rng.uniform(-180, 540, 5000)
+        expected = lookup.get_tags_altaz(alt, az)
+        for i in range(len(alt)):
+            assert lookup.get_tag_altaz(alt[i], az[i]) == expected[i]
+        # the poles and the edges of the raster
+        for alt, az in [(90, 0), (90, 359.999), (0, 0), (0, 360), (89.99, 180)]:
+            assert lookup.get_tag_altaz(alt, az) == lookup.get_tags_altaz(alt, az)
+
+    def test_stale_raster_is_ignored(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+        model = tmp_path / "model.csv"
+        model.write_text("0.5,0.5,900\n1.0,2.0,850\n")
+        compile_raster(str(model), resolution=1.0)
+        assert _load_raster(str(model)) is not None
+        model.write_text("0.5,0.5,900\n1.0,2.0,851\n")
+        assert _load_raster(str(model)) is None
+
+    def test_model_is_loaded_lazily_and_shared(self):
+        first, second = DomeLookupTable(), DomeLookupTable()
+        assert first._model is None  # nothing parsed until the first lookup
+        first.get_tag_altaz(45, 180)
+        second.get_tag_altaz(45, 180)
+        assert first._model is second._model
+
+    def test_binary_cache_follows_the_csv(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+        model = tmp_path / "model.csv"
+        model.write_text("0.5,0.5,900\n1.0,2.0,850\n")
+        assert DomeLookupTable(str(model)).get_tag_altaz(60, 115) == 850
+        assert len(list((tmp_path / "cache" / "chimera_lna").glob("*.npy"))) == 1
+        # same content: served from the memory-mapped cache
+        assert load_dome_model(str(model)) is load_dome_model(str(model))
+
+        model.write_text("0.5,0.5,900\n1.0,2.0,851\n1.0,2.0,852\n")
+        assert DomeLookupTable(str(model)).get_tag_altaz(60, 115) == 851
+        assert len(list((tmp_path / "cache" / "chimera_lna").glob("*.npy"))) == 2
+
+
+class TestTagCache:
+    def test_repeated_lookups_hit(self):
+        lookup = DomeLookupTable()
+        cache = TagCache(lookup, quantum=0.05)
+        tag = cache.get_tag_altaz(45.0, 180.0)
+        assert tag == lookup.get_tag_altaz(45.0, 180.0)
+        # a tracking telescope a hair away: same quantized key
+        assert cache.get_tag_altaz(45.01, 180.01) == tag
+        assert cache.get_tag_altaz(45.0, 540.0) == tag  # az wraps
+        assert cache.stats() == {"hits": 2, "misses": 1, "size": 1}
+
+    def test_bounded_and_invalidated(self):
+        cache = TagCache(DomeLookupTable(), quantum=1.0, maxsize=3)
+        for az in range(10):
+            cache.get_tag_altaz(45.0, az)
+        assert cache.stats()["size"] == 3
+        cache.get_tag_altaz(45.0, 9)  # most recent entry survived
+        assert cache.hits == 1
+        cache.invalidate()
+        assert cache.stats()["size"] == 0
+        cache.get_tag_altaz(45.0, 9)
+        assert cache.misses == 11
@@ -0,0 +1,66 @@
+# SPDX-FileCopyrightText: 2014-present William Schoenell <wschoenell@gmail.com>
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+import os
+import stat
+
+import pytest
+
+from chimera_lna.util.metrics import MetricsRegistry
+
+
+class TestMetricsRegistry:
+    def test_same_name_and_labels_is_the_same_metric(self):
+        metrics = MetricsRegistry()
+        metrics.counter("retries_total", command="STATUS").inc()
+        metrics.counter("retries_total", command="STATUS").inc(2)
+        metrics.counter("retries_total", command="MOVER").inc()
+        values = {
+            m["labels"]["command"]: m["value"]
+            for m in metrics.snapshot()["retries_total"]
+        }
+        assert values == {"STATUS": 3, "MOVER": 1}
+        with pytest.raises(ValueError):
+            metrics.histogram("retries_total")
+
+    def test_histogram(self):
+        metrics = MetricsRegistry()
+        rtt = metrics.histogram("rtt_seconds", buckets=(0.01, 0.1, 1.0))
+        for value in (0.005, 0.01, 0.05, 0.05, 3.0):
+            rtt.observe(value)
+        # bucket bounds are inclusive (Prometheus "le")
+        assert rtt.cumulative() == [(0.01, 2), (0.1, 4), (1.0, 4), (float("inf"), 5)]
+        assert rtt.quantile(0.5) == 0.1
+        assert rtt.quantile(1.0) == 3.0  # +Inf bucket: the largest seen
+        snapshot = metrics.snapshot()["rtt_seconds"][0]
+        assert snapshot["count"] == 5 and snapshot["max"] == 3.0
+
+    def test_prometheus_text(self, tmp_path):
+        metrics = MetricsRegistry("dome_", {"rtt_seconds": "Round trip."})
+        metrics.histogram("rtt_seconds", buckets=(0.1,), command='say "hi"').observe(
+            0.05
+        )
+        metrics.gauge("link_up").set(1)
+        ratio = []
+        metrics.on_collect(lambda: ratio.append(1))
+        text = metrics.to_prometheus()
+        assert ratio  # collect hooks ran before the export
+        assert text.splitlines() == [
+            "# TYPE dome_link_up gauge",
+            "dome_link_up 1",
+            "# HELP dome_rtt_seconds Round trip.",
+            "# TYPE dome_rtt_seconds histogram",
+            'dome_rtt_seconds_bucket{command="say \\"hi\\"",le="0.1"} 1',
+            'dome_rtt_seconds_bucket{command="say \\"hi\\"",le="+Inf"} 1',
+            'dome_rtt_seconds_sum{command="say \\"hi\\""} 0.05',
+            'dome_rtt_seconds_count{command="say \\"hi\\""} 1',
+        ]
+
+        path = tmp_path / "dome.prom"
+        metrics.write_prometheus(path)
+        assert path.read_text() == metrics.to_prometheus()
+        assert [p.name for p in tmp_path.iterdir()] == ["dome.prom"]
+        # readable by node_exporter, running as another user
+        umask = os.umask(0o022)
+        os.umask(umask)
+        assert stat.S_IMODE(path.stat().st_mode) == 0o666 & ~umask
@@ -0,0 +1,69 @@
+# SPDX-FileCopyrightText: 2014-present William Schoenell <wschoenell@gmail.com>
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+from chimera_lna.util.slew import (
+    CANCELLED,
+    DONE,
+    FAILED,
+    MOVING,
+    QUEUED,
+    SUPERSEDED,
+    SlewHandle,
+)
+
+
+class TestSlewHandle:
+    def test_progress_and_callbacks(self):
+        slew = SlewHandle(90.0)
+        seen = []
+        slew.on_progress(lambda progress: seen.append(progress["state"]))
+        slew.on_progress(lambda progress: 1 / 0)  # must not break the slew
+        slew.update(state=MOVING, target_tag=846, tag=900, eta=1.5)
+        progress = slew.progress()
+        assert progress["id"] == slew.id
+        assert (progress["target_tag"], progress["tag"]) == (846, 900)
+        assert slew.wait(0.01) is None
+        slew.finish(True)
+        assert seen == [QUEUED, MOVING, DONE]
+        assert slew.wait(0) is True
+        assert slew.progress()["eta"] is None
+        # final: later reports change nothing
+        slew.update(tag=850)
+        slew.finish(False)
+        assert slew.progress()["tag"] == 900
+        assert not slew.cancel()
+        assert SlewHandle(10.0).id != slew.id
+
+    def test_cancel(self):
+        stops = []
+        slew = SlewHandle(90.0, on_cancel=stops.append)
+        assert not slew.sleep(0.01)
+        assert slew.cancel()
+        assert slew.cancelled
+        assert stops == [slew]
+        # once
+        assert not slew.cancel()
+        assert stops == [slew]
+        quiet = SlewHandle(90.0, on_cancel=stops.append)
+        assert quiet.cancel(stop=False)
+        assert stops == [slew]
+        assert slew.sleep(10)
+        slew.finish(False)
+        assert slew.state == CANCELLED
+        failed = SlewHandle(90.0)
+        failed.finish(False)
+        assert failed.state == FAILED
+
+    def test_superseded(self):
+        slew = SlewHandle(90.0)
+        slew.supersede()
+        assert slew.superseded
+        assert not slew.cancelled
+        assert slew.sleep(10)
+        slew.finish(False)
+        assert slew.state == SUPERSEDED
+        # it got there anyway
+        reached = SlewHandle(90.0)
+        reached.supersede()
+        reached.finish(True)
+        assert reached.state == DONE
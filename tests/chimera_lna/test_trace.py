@@ -0,0 +1,75 @@
+# SPDX-FileCopyrightText: 2014-present William Schoenell <wschoenell@gmail.com>
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+import gzip
+import json
+import time
+
+from chimera_lna.util.trace import TraceLog
+
+
+def _records(text):
+    return [json.loads(line) for line in text.splitlines()]
+
+
+class TestTraceLog:
+    def test_records(self, tmp_path):
+        path = tmp_path / "dome-debug.log"
+        trace = TraceLog(str(path)).start()
+        trace.record("write", "MEADE PROG STATUS")
+        trace.record("read", "MEADE PROG STATUS", "        900 *0010000000000000")
+        trace.record("heal", detail="probing the dome")
+        trace.close()
+        records = _records(path.read_text())
+        assert [r["ev"] for r in records] == ["write", "read", "heal"]
+        assert records[1]["cmd"] == "MEADE PROG STATUS"
+        assert records[1]["d"] == "        900 *0010000000000000"
+        assert "cmd" not in records[2]
+        assert records[0]["th"] == "MainThread"
+        assert records[0]["t"] <= records[2]["t"]
+
+    def test_record_never_waits_for_the_writer(self, tmp_path):
+        trace = TraceLog(str(tmp_path / "dome-debug.log"), capacity=10)
+        # not started: nothing drains the buffer
+        for i in range(25):
+            trace.record("write", f"cmd {i}")
+        assert trace.dropped == 15
+        trace.start()
+        trace.close()
+        records = _records((tmp_path / "dome-debug.log").read_text())
+        assert [r["cmd"] for r in records] == [f"cmd {i}" for i in range(15, 25)]
+
+    def test_previous_run_is_kept(self, tmp_path):
+        path = tmp_path / "dome-debug.log"
+        path.write_text('{"ev":"last night"}\n')
+        trace = TraceLog(str(path)).start()
+        trace.record("write", "tonight")
+        trace.close()
+        assert _records(path.read_text())[0]["cmd"] == "tonight"
+        (segment,) = trace.segments()
+        assert segment.endswith(".gz")
+        with gzip.open(segment, "rt") as f:
+            assert _records(f.read()) == [{"ev": "last night"}]
+
+    def test_rotation_by_size_keeps_the_newest_segments(self, tmp_path):
+        path = tmp_path / "dome-debug.log"
+        trace = TraceLog(
+            str(path), max_bytes=200, backups=3, compress=False, flush_interval=0.01
+        ).start()
+        for i in range(40):
+            trace.record("write", f"MEADE DOMO MOVER = {900 + i}")
+            trace.flush()
+            while trace._buffer:
+                time.sleep(0.001)
+        trace.close()
+        segments = trace.segments()
+        assert len(segments) == 3
+        written = []
+        for segment in segments + [str(path)]:
+            with open(segment) as f:
+                written += [r["cmd"] for r in _records(f.read())]
+        # the oldest segments were pruned; what is left is contiguous
+        assert (
+            written
+            == [f"MEADE DOMO MOVER = {900 + i}" for i in range(40)][-len(written) :]
+        )